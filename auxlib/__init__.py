@@ -77,6 +77,10 @@ class _Null(object):
     def __hash__(self):
         return hash(_Null)
 
+    def __reduce__(self):
+        # pickle by reference so that NULL remains a singleton after a round trip
+        return 'NULL'
+
 
 # Use this NULL object when needing to distinguish a value from None
 # For example, when parsing json, you may need to determine if a json key was given and set
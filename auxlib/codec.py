@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+"""Compact binary serialization for :mod:`auxlib.entity` objects.
+
+Two formats are provided: a schema-driven binary format, via `encode()` and `decode()` or
+`Entity.binary()` and `Entity.from_binary()`, and MessagePack, via `msgpack_encode()` and
+`msgpack_decode()` or `Entity.msgpack()` and `Entity.from_msgpack()`.
+
+MessagePack maps use field names as keys, so they can be read by any msgpack consumer. Aware
+DateField values are msgpack timestamps. Naive ones use extension type 1, with the same layout as
+a timestamp. The msgpack package is used when installed. Otherwise, a vendored pure-python
+implementation is used.
+
+The binary format is derived from an Entity class's `__fields__`, and is meant for
+service-to-service traffic where both ends share the same Entity definitions. Field names are
+never written; each field is identified by its position in `__fields__`. Adding new fields to the
+end of a class keeps previously encoded data readable. Reordering or removing fields does not.
+
+Values are encoded according to field type:
+  - IntegerField: zigzag varint
+  - NumberField: one type byte, then a zigzag varint, a float64, or two float64s for complex
+  - BooleanField: one byte
+  - StringField: varint length, then utf-8 bytes
+  - DateField: microseconds since the epoch as a zigzag varint. For timezone-aware values, the
+    utc offset in seconds follows.
+  - EnumField: the member's ordinal position in the Enum class, as a varint
+  - ComposableField: the nested entity, encoded inline
+  - ListField: varint length, then the elements. Entity elements are encoded inline. Other
+    elements use a self-describing encoding, which is also used for MapField and any other
+    Field subclass.
+
+Encoding follows the same rules as `Entity.dump()`. Fields that would be left out of a dump are
+left out of the encoded bytes, and they take their default values when decoded. A field
+explicitly set to None is encoded as null and decoded as None.
+
+Examples:
+    >>> from auxlib.entity import Entity, EnumField, IntField, StringField
+    >>> class Color(Enum):
+    ...     blue = 0
+    ...     red = 1
+    >>> class Car(Entity):
+    ...     name = StringField()
+    ...     wheels = IntField(default=4)
+    ...     color = EnumField(Color, nullable=True)
+    >>> car = Car(name='roadster', color=None)
+    >>> data = car.binary()
+    >>> len(data), len(car.json())
+    (15, 48)
+    >>> Car.from_binary(data) == car
+    True
+
+"""
+from __future__ import absolute_import, division, print_function
+
+from datetime import datetime, timedelta
+from logging import getLogger
+from struct import Struct
+
+from enum import Enum
+
+from . import NULL
+from ._vendor.boltons.timeutils import ConstantTZInfo
+from .compat import integer_types, iteritems, string_types, text_type
+from .exceptions import ValidationError
+
+log = getLogger(__name__)
+
+__all__ = ["encode", "decode", "msgpack_encode", "msgpack_decode"]
+
+FORMAT_VERSION = 1
+
+_DOUBLE = Struct('>d')
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_AWARE = datetime(1970, 1, 1, tzinfo=ConstantTZInfo('UTC'))
+
+# type bytes for self-describing values
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _COMPLEX, _STR, _BYTES, _LIST, _MAP = bytearray(b'NTFidcsblm')
+
+
+def _truncated():
+    return ValidationError(None, msg="Unexpected end of binary entity data.")
+
+
+class _Reader(object):
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+        self.pos = 0
+
+    def byte(self):
+        try:
+            value = self.data[self.pos]
+        except IndexError:
+            raise _truncated()
+        self.pos += 1
+        return value
+
+    def take(self, length):
+        start = self.pos
+        self.pos += length
+        if self.pos > len(self.data):
+            raise _truncated()
+        return self.data[start:self.pos]
+
+    def varint(self):
+        data, pos, shift, result = self.data, self.pos, 0, 0
+        while True:
+            try:
+                value = data[pos]
+            except IndexError:
+                raise _truncated()
+            pos += 1
+            result |= (value & 0x7f) << shift
+            if not value & 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def zigzag(self):
+        value = self.varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def double(self):
+        return _DOUBLE.unpack(bytes(self.take(8)))[0]
+
+    def text(self):
+        return self.take(self.varint()).decode('utf-8')
+
+
+def _write_varint(buf, value):
+    while value > 0x7f:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _write_zigzag(buf, value):
+    _write_varint(buf, (value << 1) if value >= 0 else ((-value) << 1) - 1)
+
+
+def _write_text(buf, value):
+    data = text_type(value).encode('utf-8')
+    _write_varint(buf, len(data))
+    buf.extend(data)
+
+
+def _write_value(buf, value):
+    """Self-describing encoding for values not covered by a field type."""
+    if value is None:
+        buf.append(_NONE)
+    elif value is True:
+        buf.append(_TRUE)
+    elif value is False:
+        buf.append(_FALSE)
+    elif isinstance(value, integer_types):
+        buf.append(_INT)
+        _write_zigzag(buf, value)
+    elif isinstance(value, float):
+        buf.append(_FLOAT)
+        buf.extend(_DOUBLE.pack(value))
+    elif isinstance(value, complex):
+        buf.append(_COMPLEX)
+        buf.extend(_DOUBLE.pack(value.real))
+        buf.extend(_DOUBLE.pack(value.imag))
+    elif isinstance(value, string_types):
+        buf.append(_STR)
+        _write_text(buf, value)
+    elif isinstance(value, (bytes, bytearray)):
+        buf.append(_BYTES)
+        _write_varint(buf, len(value))
+        buf.extend(value)
+    elif isinstance(value, Enum):
+        _write_value(buf, value.value)
+    elif hasattr(value, 'dump'):
+        _write_value(buf, value.dump())
+    elif hasattr(value, 'keys'):
+        buf.append(_MAP)
+        _write_varint(buf, len(value))
+        for key in value:
+            _write_value(buf, key)
+            _write_value(buf, value[key])
+    elif hasattr(value, '__iter__'):
+        value = tuple(value)
+        buf.append(_LIST)
+        _write_varint(buf, len(value))
+        for element in value:
+            _write_value(buf, element)
+    else:
+        raise ValidationError(None, msg="Cannot binary encode value {0!r}".format(value))
+
+
+def _read_value(reader):
+    kind = reader.byte()
+    if kind == _NONE:
+        return None
+    elif kind == _TRUE:
+        return True
+    elif kind == _FALSE:
+        return False
+    elif kind == _INT:
+        return reader.zigzag()
+    elif kind == _FLOAT:
+        return reader.double()
+    elif kind == _COMPLEX:
+        return complex(reader.double(), reader.double())
+    elif kind == _STR:
+        return reader.text()
+    elif kind == _BYTES:
+        return bytes(reader.take(reader.varint()))
+    elif kind == _LIST:
+        return [_read_value(reader) for _ in range(reader.varint())]
+    elif kind == _MAP:
+        return dict((_read_value(reader), _read_value(reader)) for _ in range(reader.varint()))
+    raise ValidationError(None, msg="Unknown binary value type {0!r}".format(chr(kind)))
+
+
+def _write_number(buf, value):
+    if isinstance(value, integer_types):
+        buf.append(_INT)
+        _write_zigzag(buf, value)
+    else:
+        _write_value(buf, value)
+
+
+def _write_date(buf, value):
+    offset = value.utcoffset()
+    if offset is None:
+        buf.append(0)
+        delta = value - _EPOCH
+    else:
+        buf.append(1)
+        delta = value - _EPOCH_AWARE
+    _write_zigzag(buf, (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+    if offset is not None:
+        _write_zigzag(buf, offset.days * 86400 + offset.seconds)
+
+
+def _read_date(reader):
+    aware = reader.byte()
+    delta = timedelta(microseconds=reader.zigzag())
+    if not aware:
+        return _EPOCH + delta
+    offset = timedelta(seconds=reader.zigzag())
+    return (_EPOCH_AWARE + delta).astimezone(ConstantTZInfo(offset=offset))
+
+
+def _entity_codec(entity_class):
+    return (lambda buf, value: _write_entity(buf, value, entity_class),
+            lambda reader: _read_entity(entity_class, reader))
+
+
+def _field_codec(field):
+    """Returns (write, read) functions for the values of a given field."""
+    from .entity import (BooleanField, ComposableField, DateField, Entity, EnumField,
+                         IntegerField, ListField, NumberField, StringField)
+    if isinstance(field, BooleanField):
+        return (lambda buf, value: buf.append(1 if value else 0),
+                lambda reader: bool(reader.byte()))
+    elif isinstance(field, IntegerField):
+        return _write_zigzag, _Reader.zigzag
+    elif isinstance(field, NumberField):
+        return _write_number, _read_value
+    elif isinstance(field, StringField):
+        return _write_text, _Reader.text
+    elif isinstance(field, DateField):
+        return _write_date, _read_date
+    elif isinstance(field, EnumField):
+        members = tuple(field.type)
+        ordinals = dict((member, q) for q, member in enumerate(members))
+        return (lambda buf, value: _write_varint(buf, ordinals[value]),
+                lambda reader: members[reader.varint()])
+    elif isinstance(field, ComposableField):
+        return _entity_codec(field.type)
+    elif isinstance(field, ListField):
+        element_type = field._element_type
+        if isinstance(element_type, type) and issubclass(element_type, Entity):
+            write_element, read_element = _entity_codec(element_type)
+        else:
+            write_element, read_element = _write_value, _read_value
+
+        def write_list(buf, value):
+            _write_varint(buf, len(value))
+            for element in value:
+                write_element(buf, element)
+
+        def read_list(reader):
+            return [read_element(reader) for _ in range(reader.varint())]
+        return write_list, read_list
+    else:
+        return (lambda buf, value: _write_value(buf, field.dump(None, None, value)),
+                _read_value)
+
+
+_plans = {}
+
+
+def _plan(entity_class):
+    """Returns a tuple of (tag, name, field, write, read) for each field of an Entity class."""
+    try:
+        return _plans[entity_class]
+    except KeyError:
+        plan = tuple((tag, name, field) + _field_codec(field)
+                     for tag, (name, field) in enumerate(iteritems(entity_class.__fields__)))
+        return _plans.setdefault(entity_class, plan)
+
+
+def _write_entity(buf, entity, entity_class):
+    present = []
+    for tag, name, field, write, _ in _plan(entity_class):
+        if not field.in_dump:
+            continue
+        value = getattr(entity, name, NULL)
+        if value is NULL or (value is field.default and not field.default_in_dump):
+            continue
+        present.append((tag, write, value))
+    _write_varint(buf, len(present))
+    for tag, write, value in present:
+        # the low bit of the tag flags a null value
+        if value is None:
+            _write_varint(buf, tag << 1 | 1)
+        else:
+            _write_varint(buf, tag << 1)
+            write(buf, value)
+
+
+def _read_entity(entity_class, reader):
+    plan = _plan(entity_class)
+    kwargs = {}
+    for _ in range(reader.varint()):
+        tag = reader.varint()
+        try:
+            _, name, _, _, read = plan[tag >> 1]
+        except IndexError:
+            raise ValidationError(None, msg="Unknown field tag {0} for {1}"
+                                            "".format(tag >> 1, entity_class.__name__))
+        kwargs[name] = None if tag & 1 else read(reader)
+    return entity_class(**kwargs)
+
+
+def encode(entity):
+    """Encode an Entity instance to bytes."""
+    buf = bytearray((FORMAT_VERSION, ))
+    _write_entity(buf, entity, entity.__class__)
+    return bytes(buf)
+
+
+def decode(entity_class, data):
+    """Decode bytes created with `encode()` into a new instance of entity_class."""
+    reader = _Reader(data)
+    version = reader.byte()
+    if version != FORMAT_VERSION:
+        raise ValidationError(None, msg="Unsupported binary entity format version "
+                                        "{0}".format(version))
+    return _read_entity(entity_class, reader)
+
+
+# #############################
+# MessagePack
+# #############################
+
+try:
+    import msgpack as _msgpack
+except ImportError:  # pragma: no cover
+    _msgpack = None
+from ._vendor import umsgpack as _umsgpack
+
+_TIMESTAMP_EXT = -1
+_NAIVE_TIMESTAMP_EXT = 1  # the timestamp extension's encoding, for a naive datetime in utc
+_UINT32, _UINT64, _TIMESTAMP96 = Struct('>I'), Struct('>Q'), Struct('>Iq')
+
+
+def _timestamp_data(seconds, nanoseconds):
+    # https://github.com/msgpack/msgpack/blob/master/spec.md#timestamp-extension-type
+    if nanoseconds == 0 and 0 <= seconds < 2 ** 32:
+        return _UINT32.pack(seconds)
+    elif 0 <= seconds < 2 ** 34:
+        return _UINT64.pack(nanoseconds << 34 | seconds)
+    return _TIMESTAMP96.pack(nanoseconds, seconds)
+
+
+def _naive_datetime(data):
+    data = bytes(data)
+    if len(data) == 4:
+        seconds, nanoseconds = _UINT32.unpack(data)[0], 0
+    elif len(data) == 8:
+        value = _UINT64.unpack(data)[0]
+        seconds, nanoseconds = value & 0x3ffffffff, value >> 34
+    elif len(data) == 12:
+        nanoseconds, seconds = _TIMESTAMP96.unpack(data)
+    else:
+        raise ValueError("Invalid naive timestamp of {0} bytes".format(len(data)))
+    return _EPOCH + timedelta(seconds=seconds, microseconds=nanoseconds // 1000)
+
+
+class _CMsgpack(object):
+    """The msgpack package, which includes a C extension on most platforms."""
+
+    def __init__(self, module):
+        self.module = module
+        self.errors = (ValueError, module.UnpackException)
+
+    def timestamp(self, seconds, nanoseconds):
+        return self.module.Timestamp(seconds, nanoseconds)
+
+    def ext(self, code, data):
+        return self.module.ExtType(code, data)
+
+    def packb(self, obj):
+        return self.module.packb(obj, use_bin_type=True)
+
+    def unpackb(self, data):
+        # timestamp=3 returns timestamps as aware datetime objects
+        return self.module.unpackb(data, raw=False, strict_map_key=False, timestamp=3,
+                                   ext_hook=self.__ext_hook)
+
+    def __ext_hook(self, code, data):
+        if code == _NAIVE_TIMESTAMP_EXT:
+            return _naive_datetime(data)
+        return self.module.ExtType(code, data)
+
+
+class _UMsgpack(object):
+    """Pure-python fallback vendored in auxlib._vendor.umsgpack."""
+
+    errors = (ValueError, _umsgpack.UnpackException)
+    ext_handlers = {_NAIVE_TIMESTAMP_EXT: lambda ext: _naive_datetime(ext.data)}
+
+    def timestamp(self, seconds, nanoseconds):
+        return _umsgpack.Ext(_TIMESTAMP_EXT, _timestamp_data(seconds, nanoseconds))
+
+    def ext(self, code, data):
+        return _umsgpack.Ext(code, data)
+
+    def packb(self, obj):
+        return _umsgpack.packb(obj)
+
+    def unpackb(self, data):
+        return _umsgpack.unpackb(data, ext_handlers=self.ext_handlers)
+
+
+# msgpack gained Timestamp support in version 1.0
+_msgpack_backend = (_CMsgpack(_msgpack) if hasattr(_msgpack, 'Timestamp')
+                    else _UMsgpack())
+
+
+def _timestamp_ext(value):
+    if value.utcoffset() is None:
+        delta = value - _EPOCH
+        return _msgpack_backend.ext(_NAIVE_TIMESTAMP_EXT, _timestamp_data(
+            delta.days * 86400 + delta.seconds, delta.microseconds * 1000))
+    delta = value - _EPOCH_AWARE
+    return _msgpack_backend.timestamp(delta.days * 86400 + delta.seconds,
+                                      delta.microseconds * 1000)
+
+
+def _read_timestamp(value):
+    # the backends unpack both timestamp extension types to datetime objects
+    if isinstance(value, (datetime, ) + string_types):
+        return value
+    raise ValidationError(None, msg="Expected a msgpack timestamp, not {0!r}".format(value))
+
+
+def _plain(value):
+    """Reduce a dumped value to types every msgpack implementation can pack."""
+    if isinstance(value, Enum):
+        return value.value
+    elif hasattr(value, 'keys') and not isinstance(value, dict):
+        return dict((_plain(k), _plain(value[k])) for k in value)
+    elif isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    elif isinstance(value, datetime):
+        return _timestamp_ext(value)
+    return value
+
+
+def _msgpack_field_codec(field):
+    """Returns (to_wire, from_wire) functions for the values of a given field."""
+    from .entity import ComposableField, DateField, Entity, EnumField, ListField
+    if isinstance(field, DateField):
+        return _timestamp_ext, _read_timestamp
+    elif isinstance(field, EnumField):
+        return (lambda value: value.value), None
+    elif isinstance(field, ComposableField):
+        entity_class = field.type
+        return (lambda value: _msgpack_entity_map(value, entity_class),
+                lambda value: _msgpack_entity(entity_class, value))
+    elif isinstance(field, ListField):
+        element_type = field._element_type
+        if isinstance(element_type, type) and issubclass(element_type, Entity):
+            return (lambda value: [_msgpack_entity_map(v, element_type) for v in value],
+                    lambda value: [_msgpack_entity(element_type, v) for v in value])
+    return (lambda value: _plain(field.dump(None, None, value))), None
+
+
+_msgpack_plans = {}
+
+
+def _msgpack_plan(entity_class):
+    """Returns a tuple of (name, field, to_wire, from_wire) for each field of an Entity class."""
+    try:
+        return _msgpack_plans[entity_class]
+    except KeyError:
+        plan = tuple((name, field) + _msgpack_field_codec(field)
+                     for name, field in iteritems(entity_class.__fields__))
+        return _msgpack_plans.setdefault(entity_class, plan)
+
+
+def _msgpack_entity_map(entity, entity_class):
+    result = {}
+    for name, field, to_wire, _ in _msgpack_plan(entity_class):
+        if not field.in_dump:
+            continue
+        value = getattr(entity, name, NULL)
+        if value is NULL or (value is field.default and not field.default_in_dump):
+            continue
+        result[name] = None if value is None else to_wire(value)
+    return result
+
+
+def _msgpack_entity(entity_class, mapping):
+    if not isinstance(mapping, dict):
+        raise ValidationError(None, msg="Expected a msgpack map for {0}"
+                                        "".format(entity_class.__name__))
+    for name, _, _, from_wire in _msgpack_plan(entity_class):
+        if from_wire is not None and mapping.get(name) is not None:
+            mapping[name] = from_wire(mapping[name])
+    return entity_class(**mapping)
+
+
+def msgpack_encode(entity):
+    """Encode an Entity instance to MessagePack bytes.
+
+    Timezone-aware DateField values are written with the msgpack timestamp extension type.
+    Naive datetimes are taken to be in UTC, and are written in the same format with extension
+    type 1, so `msgpack_decode()` returns them naive again.
+    """
+    return _msgpack_backend.packb(_msgpack_entity_map(entity, entity.__class__))
+
+
+def msgpack_decode(entity_class, data):
+    """Decode MessagePack bytes into a new instance of entity_class.
+
+    Timestamps are decoded as timezone-aware UTC datetimes, and extension type 1 as naive UTC
+    datetimes.
+
+    Raises:
+        ValidationError: for malformed data, or data that doesn't fit entity_class
+    """
+    try:
+        mapping = _msgpack_backend.unpackb(data)
+    except _msgpack_backend.errors as e:
+        raise ValidationError(None, msg="Invalid msgpack data for {0}: {1}"
+                                        "".format(entity_class.__name__, e))
+    try:
+        return _msgpack_entity(entity_class, mapping)
+    except ValidationError:
+        raise
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValidationError(None, msg="Invalid msgpack data for {0}: {1}"
+                                        "".format(entity_class.__name__, e))
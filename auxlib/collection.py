@@ -56,6 +56,20 @@ class frozendict(Mapping):
     def __contains__(self, key):
         return key in self._dict
 
+    # delegate iteration to the wrapped dict rather than going through __getitem__ per key
+
+    def keys(self):
+        return self._dict.keys()
+
+    def values(self):
+        return self._dict.values()
+
+    def items(self):
+        return self._dict.items()
+
+    def get(self, key, default=None):
+        return self._dict.get(key, default)
+
     def copy(self, **add_or_replace):
         return self.__class__(self, **add_or_replace)
 
@@ -84,6 +98,25 @@ class frozenodict(frozendict):
     dict_cls = odict
 
 
+class FrozenAttrDict(frozendict):
+    """An immutable mapping that also allows attribute-like access to its items.
+
+    Examples:
+        >>> d = FrozenAttrDict({'a': 1})
+        >>> d.a, d['a'], d.get('a')
+        (1, 1, 1)
+        >>> d.b
+        Traceback (most recent call last):
+        AttributeError: b
+    """
+
+    def __getattr__(self, key):
+        try:
+            return self.__dict__['_dict'][key]
+        except KeyError:
+            raise AttributeError(key)
+
+
 def first(seq, key=lambda x: bool(x), default=None, apply=lambda x: x):
     """Give the first value that satisfies the key test.
 
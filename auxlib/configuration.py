@@ -7,11 +7,13 @@ Features:
   * Can pass a list of required parameters at initialization
   * Works with encrypted files
   * Accepts multiple config files
-  * Can query information from consul
+  * Can query information from consul, and wait on it for changes
   * Does type coercion on strings
   * Composable configs
   * Ordered merge: downstream configs will override upstream
-  * Reload from sources on SIGHUP
+  * Reload from sources on SIGHUP, from a background thread
+  * Optionally watch source files, reloading only the ones that changed
+  * Optionally fetch sources concurrently with asyncio
 
 Available source types:
   * Environment variables
@@ -26,21 +28,107 @@ Notes:
 """
 from __future__ import absolute_import, division, print_function
 
+import hmac
 import inspect
+import json
 import logging
 import os
+import pickle
 import signal
-
-from .compat import string_types
-from .decorators import memoize, memoizemethod
+import threading
+from base64 import b64decode
+from datetime import datetime
+from hashlib import sha1, sha256
+from multiprocessing.pool import ThreadPool
+from os.path import abspath, dirname, isdir, isfile, join
+from tempfile import mkstemp
+from timeit import default_timer
+
+from . import NULL
+from ._vendor.six.moves.urllib.error import HTTPError
+from ._vendor.six.moves.urllib.parse import parse_qsl, quote, urlencode, urlparse
+from ._vendor.six.moves.urllib.request import Request, urlopen
+from .collection import FrozenAttrDict
+from .compat import iteritems, itervalues, string_types, text_type
+from .decorators import memoize
 from .exceptions import AssignmentError, NotFoundError
-from .path import PackageFile
-from .type_coercion import listify
+from .path import PackageFile, expand
+from .type_coercion import TypeCoercionError, listify
 from .type_coercion import typify
+from .watch import FileWatcher
 
 log = logging.getLogger(__name__)
 
 
+def _additional_source(src):
+    class_name, kwargs = next(iteritems(src))
+    return globals()[class_name](**kwargs)
+
+
+def _gather(futures, loop):
+    """Like asyncio.gather(), but also resolves on `loop` when there's nothing to wait for."""
+    import asyncio
+    if futures:
+        return asyncio.gather(*futures)
+    done = loop.create_future()
+    done.set_result([])
+    return done
+
+
+def _afetch(config, source, loop):
+    """Loads `source` on `loop`, and then its additional sources.
+
+    Returns:
+        asyncio.Future: resolves to a list of (additional source, its own list) pairs
+    """
+    import asyncio
+    source.parent_config = config
+    if hasattr(source, 'aload'):
+        loaded = asyncio.ensure_future(source.aload(), loop=loop)
+    else:
+        loaded = loop.run_in_executor(None, source.dump, True)
+    result = loop.create_future()
+
+    def on_additional(sources, fetched):
+        if fetched.cancelled():
+            result.cancel()
+        elif fetched.exception() is not None:
+            result.set_exception(fetched.exception())
+        else:
+            result.set_result(list(zip(sources, fetched.result())))
+
+    def on_loaded(loaded):
+        if loaded.cancelled():
+            return result.cancel()
+        elif loaded.exception() is not None:
+            return result.set_exception(loaded.exception())
+        items = loaded.result()
+        if hasattr(source, 'aload'):
+            source._items = items  # so dump() answers from what was fetched
+        try:
+            sources = [_additional_source(src)
+                       for src in (items or {}).get('additional_sources') or ()]
+        except Exception as e:
+            return result.set_exception(e)
+        fetched = _gather([_afetch(config, src, loop) for src in sources], loop)
+        fetched.add_done_callback(lambda fetched: on_additional(sources, fetched))
+
+    loaded.add_done_callback(on_loaded)
+    return result
+
+
+def _fingerprint(items):
+    """A hash of a source's loaded items, or None if they can't be pickled."""
+    try:
+        return sha1(pickle.dumps(items, 2)).digest()
+    except Exception:
+        return None
+
+
+def _digest(text):
+    return sha1(text.encode('utf-8') if isinstance(text, text_type) else text).hexdigest()
+
+
 @memoize
 def make_env_key(app_name, key):
     """Creates an environment key-equivalent for the given key"""
@@ -69,6 +157,20 @@ class Configuration(object):
     `15` is used to infer the type of the `FOO_BAR` environment variable. When an underlying
     parameter does not exist in a config file, the type is intelligently guessed.
 
+    Loaded values are held in an immutable snapshot, with environment overrides already typed.
+    Loading sources, `set_env()`, `unset_env()`, and reloading all build a new snapshot to the
+    side and then publish it by swapping a single reference. Reads take no lock, and always see
+    either the whole old configuration or the whole new one. An environment override that can't
+    be typed raises its error when the key is read.
+
+    `os.environ` is scanned for the app's prefix when the Configuration is created and by
+    `_reload()`. In between, overrides are only read again for the key given to `set_env()` or
+    `unset_env()`, so iterating over the configuration, or appending sources, doesn't touch the
+    environment.
+
+    `watch()` starts a background thread that reloads sources whose files change. Callbacks
+    registered with `on_change()` are called with the keys whose values changed.
+
     Args:
         app_name (str)
         config_sources (str or list, optional)
@@ -97,41 +199,112 @@ class Configuration(object):
         self.appname = appname
         self.package = package or inspect.getmodule(self).__package__
 
-        # Indicates if sources are being loaded for the first time or are being reloaded.
-        self.__initial_load = True
+        # Held by everything that builds and publishes a new snapshot, so writes don't race.
+        # Reads never take it.
+        self._lock = threading.RLock()
 
-        # The ordered list of sources from which to load key, value pairs.
+        # The ordered list of sources from which to load key, value pairs. Chained sources come
+        # after the source that names them, in the order their items are merged.
         self.__sources = list()
 
-        # The object that holds the actual key, value pairs after they're loaded from sources.
-        # Keys are stored as all lower-case. Access by key is provided in a case-insensitive way.
-        self._config_map = dict()
+        # For each loaded source: a fingerprint of its items, its additional_sources, and the
+        # merged key, value pairs up to and including it. Reloads merge again from the first
+        # source whose fingerprint changed.
+        self.__loaded = dict()
+
+        # Called with the set of changed keys whenever a new snapshot changes values.
+        self.__change_callbacks = list()
 
-        self._registered_env_keys = set()  # TODO: add explanation comments
         self._required_keys = set(listify(required_parameters))
 
+        # The published key, value pairs loaded from sources, with environment overrides.
+        self._snapshot = _Snapshot(self.appname, dict(), self.__environment_keys())
+
+        # Set by the SIGHUP handler, for a background thread to reload.
+        self.__reload_requested = threading.Event()
+        self.__reload_thread = None
+
         if hasattr(signal, 'SIGHUP'):  # Reload config on SIGHUP (UNIX only)
             self.__set_up_sighup_handler()
 
-        self.__load_environment_keys()
         self.append_sources(config_sources)
 
+    @property
+    def _config_map(self):
+        """The key, value pairs loaded from sources, without environment overrides."""
+        return self._snapshot.config_map
+
+    @property
+    def _registered_env_keys(self):
+        """Keys overridden by environment variables, which are read when a snapshot is built."""
+        return self._snapshot.env_keys
+
     def append_sources(self, config_sources):
         force_reload = True
-        for source in listify(config_sources):
-            self.__append_source(source, force_reload)
+        with self._lock:
+            for source in listify(config_sources):
+                config_map = dict(self._config_map)
+                self.__append_source(source, config_map, force_reload)
+                self.__publish(config_map)
+
+    def aload(self, config_sources, loop=None):
+        """Appends sources like `append_sources()`, but fetches them concurrently on an asyncio
+        event loop. Use it as ``await config.aload(sources)``.
+
+        Sources with an ``aload()`` method, returning an awaitable of their items, are awaited on
+        the loop. Other sources are loaded in the loop's default executor. Additional sources
+        named by a source are fetched as soon as it's loaded, concurrently with everything else.
+        Once all have been fetched, they're merged in the same order `append_sources()` would
+        merge them.
+
+        Returns:
+            asyncio.Future: resolves to this Configuration
+        """
+        import asyncio
+        loop = loop or asyncio.get_event_loop()
+        sources = listify(config_sources)
+        result = loop.create_future()
+
+        def merge(fetched):
+            if fetched.cancelled():
+                result.cancel()
+            elif fetched.exception() is not None:
+                result.set_exception(fetched.exception())
+            else:
+                try:
+                    with self._lock:
+                        for source, additional in zip(sources, fetched.result()):
+                            config_map = dict(self._config_map)
+                            self.__append_fetched(source, additional, config_map)
+                            self.__publish(config_map)
+                except Exception as e:
+                    result.set_exception(e)
+                else:
+                    result.set_result(self)
+
+        fetch = [_afetch(self, source, loop) for source in sources]
+        _gather(fetch, loop).add_done_callback(merge)
+        return result
+
+    def __append_fetched(self, source, additional, config_map, _parent_source=None):
+        source.parent_config = self
+        self.__sources.append(source)
+        self.__merge_source(source, config_map)
+        source.parent_source = _parent_source
+        for additional_source, its_additional in additional:
+            self.__append_fetched(additional_source, its_additional, config_map, source)
 
     def append_required(self, required_parameters):
         self._required_keys.update(listify(required_parameters))
 
-    def __append_source(self, source, force_reload=False, _parent_source=None):
+    def __append_source(self, source, config_map, force_reload=False, _parent_source=None):
         source.parent_config = self
-        self.__load_source(source, force_reload)
-        source.parent_source = _parent_source
         self.__sources.append(source)
+        self.__load_source(source, config_map, force_reload)
+        source.parent_source = _parent_source
 
     def verify(self):
-        self.__ensure_required_keys()
+        self.__ensure_required_keys(self._snapshot)
         return self
 
     def set_env(self, key, value):
@@ -139,40 +312,156 @@ class Configuration(object):
         environment variable with the instance object preventing an otherwise-required call to
         `reload()`.
         """
-        os.environ[make_env_key(self.appname, key)] = str(value)  # must coerce to string
-        self._registered_env_keys.add(key)
-        self._clear_memoization()
+        with self._lock:
+            os.environ[make_env_key(self.appname, key)] = str(value)  # must coerce to string
+            self.__publish(self._config_map, self._registered_env_keys | set((key, )),
+                           frozenset((key, )))
 
     def unset_env(self, key):
         """Removes an environment variable using the prepended app_name convention with `key`."""
-        os.environ.pop(make_env_key(self.appname, key), None)
-        self._registered_env_keys.discard(key)
-        self._clear_memoization()
+        with self._lock:
+            os.environ.pop(make_env_key(self.appname, key), None)
+            self.__publish(self._config_map, self._registered_env_keys - set((key, )),
+                           frozenset((key, )))
 
     def _reload(self, force=False):
         """Reloads the configuration from the file and environment variables. Useful if using
         `os.environ` instead of this class' `set_env` method, or if the underlying configuration
         file is changed externally.
+
+        With `force`, sources that report they're `modified()` are loaded again. Sources are
+        merged again only from the first one whose items changed, and environment overrides are
+        only typed again when their values change. The new snapshot is only published if it has
+        all required keys. Otherwise the current configuration is kept, and EnvironmentError is
+        raised.
+
+        Returns:
+            frozenset: keys whose values changed
+        """
+        with self._lock:
+            reloaded = [source for source in self.__sources if source.modified()] if force else ()
+            return self.__refresh(reloaded, self.__environment_keys(), None, force)
+
+    def _reload_sources(self, sources):
+        """Reloads only `sources`, and merges again from the first one whose items changed.
+        Environment overrides keep the values last read from `os.environ`.
+
+        Returns:
+            frozenset: keys whose values changed
+        """
+        with self._lock:
+            return self.__refresh(sources, self._registered_env_keys, frozenset())
+
+    def __refresh(self, reloaded, env_keys, env_changed, force=True):
+        sources, loaded = self.__sources, dict(self.__loaded)
+        try:
+            config_map = self.__remerge(reloaded)
+            if config_map is None:
+                config_map = self.__rebuild(force)
+            snapshot = _Snapshot(self.appname, config_map, env_keys, self._snapshot, env_changed)
+            self.__ensure_required_keys(snapshot)
+        except Exception:
+            self.__sources, self.__loaded = sources, loaded
+            raise
+        return self.__swap(snapshot)
+
+    def __remerge(self, reloaded):
+        """Loads the `reloaded` sources again, and merges from the first one whose items changed.
+
+        Returns:
+            dict: the merged key, value pairs, or None if the chain of sources changed, and
+                everything must be loaded again
+        """
+        sources, loaded, reloaded = self.__sources, self.__loaded, set(reloaded)
+        start = None
+        for index, source in enumerate(sources):
+            if source not in loaded:
+                return None
+            if source in reloaded:
+                items = source.dump(True)
+                fingerprint, additional_sources, _ = loaded[source]
+                if fingerprint is None or _fingerprint(items) != fingerprint:
+                    if items.get('additional_sources') != additional_sources:
+                        return None
+                    start = index if start is None else start
+        if start is None:
+            return self._config_map
+
+        config_map = dict(loaded[sources[start - 1]][2]) if start else dict()
+        for source in sources[start:]:
+            self.__merge_source(source, config_map)
+        return config_map
+
+    def __rebuild(self, force):
+        sources, self.__sources, self.__loaded = self.__sources, list(), dict()
+        config_map = dict()
+        for source in sources:
+            if source.parent_source is None:
+                # chained sources are appended again by the source that names them
+                self.__append_source(source, config_map, force)
+        return config_map
+
+    def on_change(self, callback):
+        """Registers `callback` to be called with the set of keys whose values changed, whenever
+        sources are appended or reloaded, or environment overrides change. It's called from the
+        thread making the change, after the new values are published. Returns `callback`, so
+        this can be used as a decorator.
+        """
+        self.__change_callbacks.append(callback)
+        return callback
+
+    def watch(self, interval=1.0, debounce=0.25, use_inotify=True):
+        """Starts watching the files of sources that have a `path`, such as YamlSource.
+
+        When files change, only their sources are reloaded, and only if the source reports it's
+        `modified()`. For YamlSource that means the file's content hash changed.
+
+        Returns:
+            FileWatcher: already started; call its `stop()` to stop watching
         """
-        self._config_map = dict()
-        self._registered_env_keys = set()
-        self.__reload_sources(force)
-        self.__load_environment_keys()
-        self.verify()
-        self._clear_memoization()
-
-    @memoizemethod  # memoized for performance; always use self.set_env() instead of os.setenv()
+        paths = set(source.path for source in self.__sources if source.path is not None)
+        return FileWatcher(paths, self.__reload_paths, interval, debounce, use_inotify).start()
+
+    def __reload_paths(self, paths):
+        paths = set(abspath(path) for path in paths)
+        sources = [source for source in self.__sources
+                   if source.path is not None and abspath(source.path) in paths]
+        modified = [source for source in sources if source.modified()]
+        if modified:
+            self._reload_sources(modified)
+
+    def snapshot(self):
+        """Returns the current configuration fully resolved, as an immutable mapping.
+
+        Sources are already merged and environment overrides already typed, so reading from the
+        result is a single dict lookup. Keys are used as-is, rather than lower-cased as `self[key]`
+        does. Values can also be read as attributes. Later changes to this Configuration, by
+        `set_env()` or a reload for example, aren't reflected; call `snapshot()` again for them.
+
+        Returns:
+            FrozenAttrDict
+
+        Raises:
+            EnvironmentError: when required keys are missing
+            TypeCoercionError: when an environment override can't be typed
+        """
+        snapshot = self._snapshot
+        if snapshot.frozen is None:
+            self.__ensure_required_keys(snapshot)
+            if snapshot.errors:
+                raise next(itervalues(snapshot.errors))
+            snapshot.frozen = FrozenAttrDict(snapshot.values)
+        return snapshot.frozen
+
     def __getitem__(self, key):
+        snapshot = self._snapshot
         key = key.lower()
-        if key in self._registered_env_keys:
-            from_env = os.getenv(make_env_key(self.appname, key))
-            from_sources = self._config_map.get(key)
-            return typify(from_env, type(from_sources) if from_sources is not None else None)
-        else:
-            try:
-                return self._config_map[key]
-            except KeyError as e:
-                raise NotFoundError(e)
+        try:
+            return snapshot.values[key]
+        except KeyError as e:
+            if key in snapshot.errors:
+                raise snapshot.errors[key]
+            raise NotFoundError(e)
 
     def __getattr__(self, key):
         return self[key]
@@ -187,69 +476,190 @@ class Configuration(object):
         raise AssignmentError()
 
     def __iter__(self):
-        for key in self._registered_env_keys | set(self._config_map.keys()):
-            yield key
+        return iter(self._snapshot.keys)
 
     def items(self):
-        for key in self:
-            yield key, self[key]
-
-    def __load_source(self, source, force_reload=False):
-        if force_reload and source.parent_source:
-            # TODO: double-check case of reload without force reload for chained configs
-            return
-
-        items = source.dump(force_reload)
+        snapshot = self._snapshot
+        if snapshot.errors:
+            return self.__checked_items(snapshot)
+        return iteritems(snapshot.values)
+
+    @staticmethod
+    def __checked_items(snapshot):
+        for key, value in iteritems(snapshot.values):
+            yield key, value
+        for error in itervalues(snapshot.errors):
+            raise error
+
+    @staticmethod
+    def __source_items(source, force_reload=False):
+        # copied, so the keys popped below stay in the source's cached items for a later reload
+        items = dict(source.dump(force_reload))
         if source.provides and not set(source.provides).issubset(items):
             raise NotImplementedError()  # TODO: fix this
 
         additional_requirements = items.pop('additional_requirements', None)
         if isinstance(additional_requirements, string_types):
             additional_requirements = additional_requirements.split(',')
-        self._required_keys |= set(listify(additional_requirements))
 
         additional_sources = items.pop('additional_sources', None)
+        return items, set(listify(additional_requirements)), additional_sources
 
-        self._config_map.update(items)
+    def __merge_source(self, source, config_map, force_reload=False):
+        items, requirements, additional_sources = self.__source_items(source, force_reload)
+        self._required_keys |= requirements
+        config_map.update(items)
+        self.__loaded[source] = (_fingerprint(source.dump()), additional_sources,
+                                 dict(config_map))
+        return additional_sources
 
+    def __load_source(self, source, config_map, force_reload=False):
+        if force_reload and source.parent_source:
+            # TODO: double-check case of reload without force reload for chained configs
+            return
+
+        additional_sources = self.__merge_source(source, config_map, force_reload)
         if additional_sources:
             for src in additional_sources:
-                class_name, kwargs = src.popitem()
-                additional_source = globals()[class_name](**kwargs)
-                self.__append_source(additional_source, force_reload, source)
+                additional_source = _additional_source(src)
+                self.__append_source(additional_source, config_map, force_reload, source)
 
-    def __load_environment_keys(self):
+    def __environment_keys(self):
         app_prefix = self.appname.upper() + '_'
-        for env_key in os.environ:
-            if env_key.startswith(app_prefix):
-                self._registered_env_keys.add(reverse_env_key(self.appname, env_key))
-                # We don't actually add values to _config_map here. Rather, they're pulled
-                # directly from os.environ at __getitem__ time. This allows for type casting
-                # environment variables if possible.
-
-    def __ensure_required_keys(self):
-        available_keys = self._registered_env_keys | set(self._config_map.keys())
-        missing_keys = self._required_keys - available_keys
+        return set(reverse_env_key(self.appname, env_key) for env_key in os.environ
+                   if env_key.startswith(app_prefix))
+
+    def __publish(self, config_map, env_keys=None, env_changed=frozenset()):
+        env_keys = self._registered_env_keys if env_keys is None else env_keys
+        return self.__swap(_Snapshot(self.appname, config_map, env_keys, self._snapshot,
+                                     env_changed))
+
+    def __swap(self, snapshot):
+        previous, self._snapshot = self._snapshot, snapshot
+        changed = snapshot.changed_keys(previous)
+        if changed:
+            for callback in self.__change_callbacks:
+                callback(changed)
+        return changed
+
+    def __ensure_required_keys(self, snapshot):
+        missing_keys = self._required_keys - snapshot.keys
         if missing_keys:
             raise EnvironmentError("Required key(s) not found in environment\n"
                                    "  or configuration sources.\n"
                                    "  Missing Keys: {0}".format(list(missing_keys)))
 
     def _clear_memoization(self):
-        self.__dict__.pop('_memoized_results', None)
+        """Publishes a new snapshot, typing environment overrides again from `os.environ`."""
+        with self._lock:
+            self.__publish(self._config_map, env_changed=None)
 
     def __set_up_sighup_handler(self):
         def sighup_handler(signum, frame):
             if signum != signal.SIGHUP:
                 return
-            self._reload(True)
+            # The handler runs on the main thread, which may be holding self._lock in the middle
+            # of an update. Reloading here would re-enter the lock, so another thread reloads
+            # once the lock is free.
+            self.__request_reload()
             if callable(self.__previous_sighup_handler):
                 self.__previous_sighup_handler(signum, frame)
         self.__previous_sighup_handler = signal.getsignal(signal.SIGHUP)
         signal.signal(signal.SIGHUP, sighup_handler)
 
+    def __request_reload(self):
+        self.__reload_requested.set()
+        if self.__reload_thread is None:
+            self.__reload_thread = threading.Thread(target=self.__run_requested_reloads,
+                                                    name='auxlib-config-reload')
+            self.__reload_thread.daemon = True
+            self.__reload_thread.start()
+
+    def __run_requested_reloads(self):
+        while True:
+            self.__reload_requested.wait()
+            self.__reload_requested.clear()
+            try:
+                self._reload(True)
+            except Exception as e:
+                log.warning("reloading %s configuration on SIGHUP failed: %r", self.appname, e)
+
+
+class _Snapshot(object):
+    """An immutable view of a Configuration's loaded values.
+
+    Environment overrides are looked up and typed when the snapshot is built, unless the raw
+    value and type hint are the same as in the `previous` snapshot. Only the overrides named in
+    `env_changed` are read again from `os.environ`; the others keep their raw values from
+    `previous`. With `env_changed` None, all are read. When `config_map` is also the one
+    `previous` was built from, only the named overrides are typed again. Nothing here is
+    modified after construction, except for filling in `frozen` the first time
+    `Configuration.snapshot()` needs it, so it's safe to share between threads without a lock.
+    """
+    __slots__ = ('config_map', 'env_keys', 'env_inputs', 'keys', 'values', 'errors', 'frozen')
+
+    def __init__(self, appname, config_map, env_keys, previous=None, env_changed=None):
+        self.config_map = config_map
+        self.env_keys = env_keys = frozenset(env_keys)
+        previous_inputs = previous.env_inputs if previous is not None else {}
+        if previous is None:
+            env_changed = None
+        if env_changed is not None and config_map is previous.config_map:
+            values, errors = dict(previous.values), dict(previous.errors)
+            env_inputs = dict(previous_inputs)
+            for key in previous.env_keys - env_keys:
+                del env_inputs[key]
+                errors.pop(key, None)
+                if key in config_map:
+                    values[key] = config_map[key]
+                else:
+                    values.pop(key, None)
+            typed = (env_keys - previous.env_keys) | (env_keys & env_changed)
+        else:
+            values, errors, env_inputs = dict(config_map), dict(), dict()
+            typed = env_keys
+        for key in typed:
+            if env_changed is None or key in env_changed or key not in previous_inputs:
+                from_env = os.getenv(make_env_key(appname, key))
+            else:
+                from_env = previous_inputs[key][0]
+            from_sources = config_map.get(key)
+            env_inputs[key] = inputs = (from_env, type(from_sources)
+                                        if from_sources is not None else None)
+            if previous_inputs.get(key) == inputs:
+                if key in previous.errors:
+                    values.pop(key, None)
+                    errors[key] = previous.errors[key]
+                else:
+                    values[key] = previous.values[key]
+                continue
+            try:
+                values[key] = typify(*inputs)
+                errors.pop(key, None)
+            except (NotImplementedError, TypeCoercionError) as e:
+                values.pop(key, None)
+                errors[key] = e
+        self.keys = frozenset(values) | frozenset(errors)
+        self.values = values
+        self.errors = errors
+        self.env_inputs = env_inputs
+        self.frozen = None
+
+    def changed_keys(self, previous):
+        """Returns the keys whose values differ from those in the `previous` snapshot."""
+        values, previous_values = self.values, previous.values
+        return frozenset(key for key in self.keys | previous.keys
+                         if values.get(key, NULL) != previous_values.get(key, NULL)
+                         or (key in self.errors) != (key in previous.errors))
+
 
 class Source(object):
+    """Loads key, value pairs for a Configuration.
+
+    Subclasses implement `load()`. A subclass may also implement ``aload()``, returning an
+    awaitable of the same key, value pairs, for `Configuration.aload()` to await on its event
+    loop instead of calling `load()` in an executor.
+    """
     _items = None
     _provides = None
     _parent_source = None
@@ -258,6 +668,15 @@ class Source(object):
     def provides(self):
         return self._provides
 
+    @property
+    def path(self):
+        """The local file this source loads from, if any. `Configuration.watch()` watches it."""
+        return None
+
+    def modified(self):
+        """Returns whether loading again could give different items than the last load."""
+        return True
+
     @property
     def items(self):
         return self.dump()
@@ -289,19 +708,95 @@ class Source(object):
 
 
 class YamlSource(Source):
+    """Loads a yaml file, from the file system or from package resources.
+
+    Yaml is parsed with libyaml's CSafeLoader when it's available, and SafeLoader otherwise.
+
+    With `cache_dir`, parsed contents of a file on the file system are pickled into that
+    directory, keyed by the file's path. The cached contents are used for as long as a sha1 of
+    the file matches the one stored with them, so later loads of an unchanged file, including
+    from other processes, skip parsing. Like ``__pycache__``, `cache_dir` must only be writable
+    by trusted users.
+    """
+    _digest = None
 
-    def __init__(self, location, provides=None):
+    def __init__(self, location, provides=None, cache_dir=None):
         self._location = location
         self._provides = provides if provides else None
+        self._cache_dir = cache_dir
+
+    @property
+    def path(self):
+        path = expand(self._location)
+        return abspath(path) if isfile(path) else None
+
+    def modified(self):
+        """Compares a hash of the file's content to the content last loaded."""
+        path = self.path
+        if path is None or self._digest is None:
+            return True
+        try:
+            with open(path, 'rb') as fh:
+                return _digest(fh.read()) != self._digest
+        except (IOError, OSError):
+            return True
 
     def load(self):
-        with PackageFile(self._location, self.parent_config.package) as fh:
-            import yaml
-            contents = yaml.load(fh)
-            if self.provides is None:
-                return contents
-            else:
-                return dict((key, contents[key]) for key in self.provides)
+        path = self.path
+        if path is None:
+            with PackageFile(self._location, self.parent_config.package) as fh:
+                text = fh.read()
+            self._digest = _digest(text)
+            contents = _parse_yaml(text)
+        else:
+            contents = self.__load_file(path)
+        if self.provides is None:
+            return contents
+        else:
+            return dict((key, contents[key]) for key in self.provides)
+
+    def __load_file(self, path):
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        self._digest = digest = _digest(data)
+        if not self._cache_dir:
+            return _parse_yaml(data)
+
+        cache_path = join(self._cache_dir, _digest(path) + '.pickle')
+        cached = _read_cache(cache_path)
+        if cached is not None and cached[0] == (path, digest):
+            return cached[1]
+        contents = _parse_yaml(data)
+        _write_cache(cache_path, ((path, digest), contents))
+        return contents
+
+
+def _parse_yaml(text):
+    import yaml
+    return yaml.load(text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as fh:
+            return pickle.load(fh)
+    except (IOError, OSError):
+        return None
+    except Exception as e:  # a truncated or otherwise unreadable pickle can raise most anything
+        log.debug("ignoring unreadable yaml cache %s: %r", cache_path, e)
+        return None
+
+
+def _write_cache(cache_path, value):
+    try:
+        if not isdir(dirname(cache_path)):
+            os.makedirs(dirname(cache_path))
+        fd, temp_path = mkstemp(dir=dirname(cache_path))
+        with os.fdopen(fd, 'wb') as fh:
+            pickle.dump(value, fh, 2)
+        os.rename(temp_path, cache_path)
+    except (IOError, OSError, pickle.PicklingError) as e:
+        log.debug("unable to write yaml cache %s: %r", cache_path, e)
 
 
 class EnvironmentMappedSource(Source):
@@ -316,3 +811,411 @@ class EnvironmentMappedSource(Source):
         mapped_source.parent_config = self.parent_config
         params = mapped_source.load()
         return params
+
+
+def _urlopen(url, method='GET', headers=None, data=None, timeout=None):
+    """Opens `url`. Responses with an HTTP error status are returned rather than raised, so
+    callers check `getcode()`. Connection failures raise IOError (URLError)."""
+    request = Request(url, data=data, headers=dict(headers or {}))
+    request.get_method = lambda: method
+    try:
+        return urlopen(request, timeout=timeout)
+    except HTTPError as e:
+        return e
+
+
+class ConsulSource(Source):
+    """Loads the keys under a Consul KV `prefix`, with one recursive request.
+
+    Keys are taken relative to `prefix`, lower-cased, with ``/`` replaced by ``_``. Values are
+    typed from their string form, like environment variables. Folders are skipped.
+
+    With `cache_dir`, every successful load is also cached on disk. When Consul can't be reached,
+    the cached items are used instead, so processes can start while Consul is down.
+
+    `watch()` starts a thread waiting on Consul blocking queries. When anything under `prefix`
+    changes, just this source is reloaded in the parent Configuration, from the items the
+    blocking query returned, and only keys whose values changed are published as changed.
+
+    Args:
+        prefix (str)
+        url (str): the Consul agent's http address
+        token (str, optional): an ACL token
+        cache_dir (str, optional)
+        wait (int): seconds a blocking query waits for a change
+        timeout (float): seconds to wait for Consul to respond, in addition to `wait`
+        retry_interval (float): seconds `watch()` waits after a failed query
+
+    """
+
+    def __init__(self, prefix, url='http://127.0.0.1:8500', token=None, cache_dir=None,
+                 wait=300, timeout=10.0, retry_interval=5.0):
+        self._prefix = prefix.strip('/')
+        self._url = url.rstrip('/')
+        self._token = token
+        self._cache_dir = cache_dir
+        self._wait = wait
+        self._timeout = timeout
+        self._retry_interval = retry_interval
+        self._index = None
+        self._fetched = None  # items from a blocking query, for the next load() to return
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self):
+        fetched, self._fetched = self._fetched, None
+        if fetched is not None:
+            return fetched
+        try:
+            self._index, items = self.__query()
+        except (IOError, OSError, ValueError) as e:
+            cached = _read_cache(self.__cache_path()) if self._cache_dir else None
+            if cached is None:
+                raise
+            log.warning("consul unavailable at %s, using cached keys: %r", self._url, e)
+            self._index, items = cached
+            return items
+        self.__write_cache(items)
+        return items
+
+    def watch(self):
+        """Starts watching for changes under `prefix`. Returns this source; `stop()` stops it."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.__watch, name='auxlib-consul-watch')
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def __watch(self):
+        while not self._stop.is_set():
+            try:
+                previous = self._index
+                index, items = self.__query(previous or 0)
+                # a smaller index means consul's state was reset; start over without blocking
+                self._index = index if index and index >= (previous or 0) else None
+                if not self._stop.is_set() and index != previous and items != self._items:
+                    self.__write_cache(items)
+                    self._fetched = items
+                    self.parent_config._reload_sources([self])
+            except Exception as e:
+                log.warning("watching consul prefix %s failed: %r", self._prefix, e)
+                self._stop.wait(self._retry_interval)
+
+    def __query(self, index=None):
+        params = [('recurse', 'true')]
+        timeout = self._timeout
+        if index is not None:
+            params.extend((('index', index), ('wait', '{0}s'.format(self._wait))))
+            timeout += self._wait * 1.1  # consul adds up to wait/16 of jitter
+        url = "{0}/v1/kv/{1}?{2}".format(self._url, quote(self._prefix), urlencode(params))
+        headers = {'X-Consul-Token': self._token} if self._token else {}
+        response = _urlopen(url, headers=headers, timeout=timeout)
+        try:
+            status, body = response.getcode(), response.read()
+            index = response.info().get('X-Consul-Index')
+        finally:
+            response.close()
+
+        if status == 404:
+            entries = []
+        elif status == 200:
+            entries = json.loads(body.decode('utf-8'))
+        else:
+            raise IOError("consul returned HTTP {0} for {1}".format(status, url))
+        return (int(index) if index else None), self.__items(entries)
+
+    def __items(self, entries):
+        items = dict()
+        for entry in entries:
+            key = entry['Key']
+            if self._prefix:
+                if not (key == self._prefix or key.startswith(self._prefix + '/')):
+                    continue
+                key = key[len(self._prefix):]
+            key = key.strip('/')
+            if not key or entry['Key'].endswith('/'):
+                continue
+            value = entry.get('Value')
+            value = None if value is None else b64decode(value).decode('utf-8')
+            items[key.replace('/', '_').lower()] = typify(value)
+        return items
+
+    def __cache_path(self):
+        return join(self._cache_dir, 'consul-' + _digest(self._url + '/' + self._prefix)
+                    + '.pickle')
+
+    def __write_cache(self, items):
+        if self._cache_dir:
+            _write_cache(self.__cache_path(), (self._index, items))
+
+
+class _Secret(object):
+    __slots__ = ('data', 'lease_id', 'renewable', 'expires', 'renew_due')
+
+    def __init__(self, data, lease_id, renewable, duration, renew_at):
+        self.data = data
+        self.lease_id = lease_id
+        self.renewable = renewable
+        self.extend(duration, renew_at)
+
+    def extend(self, duration, renew_at):
+        now = default_timer()
+        self.expires = now + duration
+        self.renew_due = now + duration * renew_at
+
+
+class VaultSource(Source):
+    """Loads secrets from HashiCorp Vault.
+
+    Every secret in `paths` is read, concurrently, and their keys merged in order, lower-cased.
+    Both version 1 and version 2 KV secrets engines are supported.
+
+    Secrets are cached in memory until their lease expires, or for `default_ttl` seconds when
+    they don't have one, so reloading the parent Configuration doesn't read them again. `watch()`
+    starts a thread that renews leases once `renew_at` of their duration has passed, and reads
+    secrets again whose leases can't be renewed. When a secret read again has changed, just this
+    source is reloaded in the parent Configuration.
+
+    Args:
+        paths (str or list): secret paths, such as ``secret/myapp``
+        url (str): the Vault server's address
+        token (str, optional): defaults to the VAULT_TOKEN environment variable
+        default_ttl (float): seconds to cache secrets that have no lease duration
+        renew_at (float): fraction of a lease's duration after which it's renewed
+        timeout (float): seconds to wait for Vault to respond
+        retry_interval (float): seconds `watch()` waits after a failed renewal or read
+
+    """
+
+    def __init__(self, paths, url='http://127.0.0.1:8200', token=None, default_ttl=300.0,
+                 renew_at=0.75, timeout=10.0, retry_interval=5.0):
+        self._paths = tuple(path.strip('/') for path in listify(paths))
+        self._url = url.rstrip('/')
+        self._token = token or os.getenv('VAULT_TOKEN')
+        self._default_ttl = default_ttl
+        self._renew_at = renew_at
+        self._timeout = timeout
+        self._retry_interval = retry_interval
+        self._secrets = dict()  # path -> _Secret
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self):
+        now = default_timer()
+        with self._lock:
+            stale = [path for path in self._paths
+                     if path not in self._secrets or self._secrets[path].expires <= now]
+        if stale:
+            pool = ThreadPool(min(len(stale), 8))
+            try:
+                secrets = pool.map(self.__read, stale)
+            finally:
+                pool.close()
+            with self._lock:
+                self._secrets.update(zip(stale, secrets))
+        items = dict()
+        with self._lock:
+            for path in self._paths:
+                items.update((key.lower(), value)
+                             for key, value in iteritems(self._secrets[path].data))
+        return items
+
+    def watch(self):
+        """Starts renewing leases in the background. Returns this source; `stop()` stops it."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.__watch, name='auxlib-vault-renewal')
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def __watch(self):
+        while not self._stop.is_set():
+            with self._lock:
+                secrets = list(self._secrets.items())
+            now = default_timer()
+            due = [(path, secret) for path, secret in secrets if secret.renew_due <= now]
+            if not due:
+                next_due = min([secret.renew_due for _, secret in secrets]
+                               or [now + self._retry_interval])
+                self._stop.wait(max(next_due - now, 0.01))
+                continue
+
+            changed = False
+            for path, secret in due:
+                try:
+                    if not (secret.renewable and secret.lease_id and self.__renew(secret)):
+                        fresh = self.__read(path)
+                        changed = changed or fresh.data != secret.data
+                        with self._lock:
+                            self._secrets[path] = fresh
+                except Exception as e:
+                    log.warning("refreshing vault secret %s failed: %r", path, e)
+                    with self._lock:
+                        secret.renew_due = default_timer() + self._retry_interval
+            if changed and not self._stop.is_set():
+                try:
+                    self.parent_config._reload_sources([self])
+                except Exception as e:
+                    log.warning("reloading changed vault secrets failed: %r", e)
+
+    def __request(self, method, path, data=None):
+        headers = {'X-Vault-Token': self._token} if self._token else {}
+        if data is not None:
+            headers['Content-Type'] = 'application/json'
+            data = json.dumps(data).encode('utf-8')
+        response = _urlopen("{0}/v1/{1}".format(self._url, path), method, headers, data,
+                            self._timeout)
+        try:
+            status, body = response.getcode(), response.read()
+        finally:
+            response.close()
+        if status != 200:
+            raise IOError("vault returned HTTP {0} for {1}".format(status, path))
+        return json.loads(body.decode('utf-8'))
+
+    def __read(self, path):
+        secret = self.__request('GET', path)
+        data = secret.get('data') or dict()
+        if 'metadata' in data and isinstance(data.get('data'), dict):
+            data = data['data']  # a kv version 2 secret
+        return _Secret(data, secret.get('lease_id'), secret.get('renewable', False),
+                       secret.get('lease_duration') or self._default_ttl, self._renew_at)
+
+    def __renew(self, secret):
+        response = self.__request('PUT', 'sys/leases/renew', {'lease_id': secret.lease_id})
+        duration = response.get('lease_duration')
+        if not duration:
+            return False
+        with self._lock:
+            secret.extend(duration, self._renew_at)
+        return True
+
+
+def _sigv4_authorization(method, url, headers, region, access_key, secret_key,
+                         payload_hash='UNSIGNED-PAYLOAD', service='s3'):
+    """Returns an AWS Signature Version 4 Authorization header value, signing the host and
+    every header in `headers`, which must include x-amz-date. The path of `url` must already be
+    percent-encoded, as it's sent; it's signed as-is."""
+    url = urlparse(url)
+    signed = dict((key.lower(), ' '.join(str(value).split())) for key, value in headers.items())
+    signed['host'] = url.netloc
+    names = sorted(signed)
+    query = '&'.join(sorted('{0}={1}'.format(quote(key, safe='~'), quote(value, safe='~'))
+                            for key, value in parse_qsl(url.query, keep_blank_values=True)))
+    canonical_request = '\n'.join((method, url.path or '/', query,
+                                   ''.join('{0}:{1}\n'.format(name, signed[name])
+                                           for name in names),
+                                   ';'.join(names), payload_hash))
+    amz_date = signed['x-amz-date']
+    scope = '/'.join((amz_date[:8], region, service, 'aws4_request'))
+    string_to_sign = '\n'.join(('AWS4-HMAC-SHA256', amz_date, scope,
+                                sha256(canonical_request.encode('utf-8')).hexdigest()))
+    key = ('AWS4' + secret_key).encode('utf-8')
+    for part in (amz_date[:8], region, service, 'aws4_request'):
+        key = hmac.new(key, part.encode('utf-8'), sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode('utf-8'), sha256).hexdigest()
+    return 'AWS4-HMAC-SHA256 Credential={0}/{1}, SignedHeaders={2}, Signature={3}'.format(
+        access_key, scope, ';'.join(names), signature)
+
+
+class S3YamlSource(Source):
+    """Loads a yaml file from S3, or any S3-compatible object store.
+
+    Objects are requested with path-style urls, ``{endpoint}/{bucket}/{key}``. Requests are
+    signed with AWS Signature Version 4 when credentials are given, or are in the standard
+    AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, and AWS_SESSION_TOKEN environment variables.
+
+    Reloads send the ETag of the last load in If-None-Match, so an unchanged object costs one
+    304 response, and isn't parsed again. A changed object's body is parsed as it streams in.
+    With `cache_dir`, parsed contents are also cached on disk with their ETag, so a new process
+    can start with a conditional request, and can start from the cache if the endpoint can't be
+    reached. Like ``__pycache__``, `cache_dir` must only be writable by trusted users.
+
+    Args:
+        location (str): ``s3://bucket/key``
+        provides (list, optional)
+        endpoint (str, optional): defaults to AWS's endpoint for `region`
+        region (str)
+        access_key (str, optional)
+        secret_key (str, optional)
+        session_token (str, optional)
+        cache_dir (str, optional)
+        timeout (float): seconds to wait for the endpoint to respond
+
+    """
+
+    def __init__(self, location, provides=None, endpoint=None, region='us-east-1',
+                 access_key=None, secret_key=None, session_token=None, cache_dir=None,
+                 timeout=10.0):
+        url = urlparse(location)
+        if url.scheme != 's3' or not url.netloc or not url.path.strip('/'):
+            raise ValueError("S3 location must look like s3://bucket/key: {0}".format(location))
+        self._location = location
+        self._provides = provides if provides else None
+        self._endpoint = (endpoint or 'https://s3.{0}.amazonaws.com'.format(region)).rstrip('/')
+        self._url = '{0}/{1}/{2}'.format(self._endpoint, url.netloc,
+                                         quote(url.path.lstrip('/'), safe='/~'))
+        self._region = region
+        self._access_key = access_key or os.getenv('AWS_ACCESS_KEY_ID')
+        self._secret_key = secret_key or os.getenv('AWS_SECRET_ACCESS_KEY')
+        self._session_token = session_token or os.getenv('AWS_SESSION_TOKEN')
+        self._cache_dir = cache_dir
+        self._timeout = timeout
+        self._etag = None
+        self._contents = None
+
+    def load(self):
+        if self._contents is None and self._cache_dir:
+            self._etag, self._contents = _read_cache(self.__cache_path()) or (None, None)
+        try:
+            contents = self.__fetch()
+        except (IOError, OSError) as e:
+            if self._contents is None:
+                raise
+            log.warning("unable to fetch %s, using cached contents: %r", self._location, e)
+            contents = self._contents
+        if self.provides is None:
+            return contents
+        else:
+            return dict((key, contents[key]) for key in self.provides)
+
+    def __fetch(self):
+        headers = {}
+        if self._access_key and self._secret_key:
+            headers['x-amz-date'] = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+            headers['x-amz-content-sha256'] = 'UNSIGNED-PAYLOAD'
+            if self._session_token:
+                headers['x-amz-security-token'] = self._session_token
+            headers['Authorization'] = _sigv4_authorization(
+                'GET', self._url, headers, self._region, self._access_key, self._secret_key)
+        if self._etag is not None:
+            headers['If-None-Match'] = self._etag
+
+        response = _urlopen(self._url, headers=headers, timeout=self._timeout)
+        try:
+            status = response.getcode()
+            if status == 304:
+                return self._contents
+            elif status != 200:
+                raise IOError("{0} returned HTTP {1}".format(self._location, status))
+            contents = _parse_yaml(response)
+            etag = response.info().get('ETag')
+        finally:
+            response.close()
+
+        self._etag, self._contents = etag, contents
+        if self._cache_dir and etag is not None:
+            _write_cache(self.__cache_path(), (etag, contents))
+        return contents
+
+    def __cache_path(self):
+        return join(self._cache_dir, 's3-' + _digest(self._url) + '.pickle')
@@ -239,20 +239,24 @@ from __future__ import absolute_import, division, print_function
 
 from collections import Mapping, Sequence
 from datetime import datetime
-from functools import reduce
-from json import JSONEncoder, dumps as json_dumps, loads as json_loads
+from json import JSONEncoder, dumps as json_dumps
 from logging import getLogger
 
 from enum import Enum
 
 from . import NULL
 from ._vendor.boltons.timeutils import isoparse
+from .codec import (decode as binary_decode, encode as binary_encode, msgpack_decode,
+                    msgpack_encode)
 from .collection import AttrDict, frozenodict, make_immutable
-from .compat import (integer_types, isiterable, iteritems, itervalues, odict, string_types,
-                     text_type, with_metaclass)
-from .exceptions import Raise, ValidationError
+from .compat import (integer_types, isiterable, iteritems, odict, string_types, text_type,
+                     with_metaclass)
+from .exceptions import BulkValidationError, Raise, ValidationError
+from .instrumentation import is_enabled as instrumentation_enabled
 from .ish import find_or_raise
 from .logz import DumpEncoder
+from .parallel import dump as parallel_dump, load as parallel_load
+from .schema import json_schema, loads as schema_loads
 from .type_coercion import maybecall
 
 log = getLogger(__name__)
@@ -261,10 +265,11 @@ __all__ = [
     "Entity", "ImmutableEntity", "Field",
     "BooleanField", "BoolField", "IntegerField", "IntField",
     "NumberField", "StringField", "DateField",
-    "EnumField", "ListField", "MapField", "ComposableField",
+    "EnumField", "ListField", "MapField", "ComposableField", "EntityPatch", "EntityView",
 ]
 
 KEY_OVERRIDES_MAP = "__key_overrides__"
+CACHE_DEFAULT_OPTIONS = (None, 'instance', 'class')
 
 
 NOTES = """
@@ -363,14 +368,24 @@ class Field(object):
         required (boolean, optional):
         validation (callable, optional):
         dump (boolean, optional):
+        cache_default (str, optional): How the result of a callable default is reused when an
+            unset field is read. None, the default, calls it on every read. 'instance' calls it
+            on the first read and stores the result on the instance as though it were
+            assigned. 'class' calls it once, and shares a validated, immutable copy of the result
+            between all instances. It isn't allowed for fields whose values hold entities or
+            mutable lists, which can't be frozen.
     """
 
+    # Whether a default can be frozen and shared between instances, for cache_default='class'
+    _shareable_default = True
+
     # Used to track order of field declarations. Supporting python 2.7, so can't rely
     #   on __prepare__.  Strategy lifted from http://stackoverflow.com/a/4460034/2127762
     _order_helper = 0
 
     def __init__(self, default=NULL, required=True, validation=None,
-                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=()):
+                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=(),
+                 cache_default=None):
         self._required = required
         self._validation = validation
         self._in_dump = in_dump
@@ -378,6 +393,13 @@ class Field(object):
         self._nullable = nullable
         self._immutable = immutable
         self._aliases = aliases
+        if cache_default not in CACHE_DEFAULT_OPTIONS:
+            raise ValidationError(None, msg="cache_default must be one of {0}"
+                                            "".format(CACHE_DEFAULT_OPTIONS))
+        if cache_default == 'class' and not self._shareable_default:
+            raise ValidationError(None, msg="cache_default='class' can't share a {0} default "
+                                            "between instances".format(self.__class__.__name__))
+        self._cache_default = cache_default
         if default is NULL:
             self._default = NULL
         else:
@@ -412,13 +434,31 @@ class Field(object):
         except KeyError:
             if self.default is NULL:
                 raise AttributeError("A value for {0} has not been set".format(self.name))
-            else:
+            elif self._cache_default is None:
                 val = maybecall(self.default)  # default *can* be a callable
+            else:
+                val = self._cached_default(instance, instance_type)
         if val is None and not self.nullable:
             # means the "tricky edge case" was activated in __delete__
             raise AttributeError("The {0} field has been deleted.".format(self.name))
         return self.unbox(instance, instance_type, val)
 
+    def _cached_default(self, instance, instance_type):
+        if not callable(self.default):
+            return self.default
+        elif self._cache_default == 'class':
+            try:
+                return self._class_default
+            except AttributeError:
+                self._class_default = make_immutable(self.validate(
+                    None, self.box(None, instance_type, maybecall(self.default))))
+                return self._class_default
+        val = self.box(instance, instance_type, maybecall(self.default))
+        if instance is not None:
+            # stored as though assigned, so the default is called at most once per instance
+            instance.__dict__[self.name] = val
+        return val
+
     def __set__(self, instance, val):
         if self.immutable and instance._initd:
             raise AttributeError("The {0} field is immutable.".format(self.name))
@@ -548,12 +588,13 @@ class DateField(Field):
 class EnumField(Field):
 
     def __init__(self, enum_class, default=NULL, required=True, validation=None,
-                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=()):
+                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=(),
+                 cache_default=None):
         if not issubclass(enum_class, Enum):
             raise ValidationError(None, msg="enum_class must be an instance of Enum")
         self._type = enum_class
-        super(EnumField, self).__init__(default, required, validation,
-                                        in_dump, default_in_dump, nullable, immutable, aliases)
+        super(EnumField, self).__init__(default, required, validation, in_dump, default_in_dump,
+                                        nullable, immutable, aliases, cache_default)
 
     def box(self, instance, instance_type, val):
         if val is None:
@@ -576,11 +617,17 @@ class EnumField(Field):
 class ListField(Field):
     _type = tuple
 
+    @property
+    def _shareable_default(self):
+        et = self._element_type
+        return self._type is tuple and not (isinstance(et, type) and issubclass(et, Entity))
+
     def __init__(self, element_type, default=NULL, required=True, validation=None,
-                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=()):
+                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=(),
+                 cache_default=None):
         self._element_type = element_type
-        super(ListField, self).__init__(default, required, validation,
-                                        in_dump, default_in_dump, nullable, immutable, aliases)
+        super(ListField, self).__init__(default, required, validation, in_dump, default_in_dump,
+                                        nullable, immutable, aliases, cache_default)
 
     def box(self, instance, instance_type, val):
         if val is None:
@@ -591,7 +638,7 @@ class ListField(Field):
         elif isiterable(val):
             et = self._element_type
             if isinstance(et, type) and issubclass(et, Entity):
-                return self._type(v if isinstance(v, et) else et(**v) for v in val)
+                return self._type(et.load_many(val))
             else:
                 return make_immutable(val) if self.immutable else self._type(val)
         else:
@@ -624,9 +671,10 @@ class MapField(Field):
     _type = frozenodict
 
     def __init__(self, default=NULL, required=True, validation=None,
-                 in_dump=True, default_in_dump=True, nullable=False, immutable=True, aliases=()):
+                 in_dump=True, default_in_dump=True, nullable=False, immutable=True, aliases=(),
+                 cache_default=None):
         super(MapField, self).__init__(default, required, validation, in_dump, default_in_dump,
-                                       nullable, immutable, aliases)
+                                       nullable, immutable, aliases, cache_default)
 
     def box(self, instance, instance_type, val):
         # TODO: really need to make this recursive to make any lists or maps immutable
@@ -644,13 +692,15 @@ class MapField(Field):
 
 
 class ComposableField(Field):
+    _shareable_default = False
 
     def __init__(self, field_class, default=NULL, required=True, validation=None,
-                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=()):
+                 in_dump=True, default_in_dump=True, nullable=False, immutable=False, aliases=(),
+                 cache_default=None):
         self._type = field_class
         super(ComposableField, self).__init__(default, required, validation,
                                               in_dump, default_in_dump, nullable, immutable,
-                                              aliases)
+                                              aliases, cache_default)
 
     def box(self, instance, instance_type, val):
         if val is None:
@@ -678,6 +728,79 @@ class ComposableField(Field):
         return None if val is None else val.dump()
 
 
+def _resolve(cls, name):
+    return next(clz.__dict__[name] for clz in cls.__mro__ if name in clz.__dict__)
+
+
+# Fast attribute reads
+# --------------------
+# Fields whose class keeps the default `__get__`, `unbox`, and the `name`, `default`, and
+#   `nullable` properties are switched, at Entity class creation, to a generated subclass with a
+#   specialized `__get__`. Instance reads of stored
+#   values and plain defaults are handled inline with a single miss check. Class access, unset
+#   fields without a default, and cached defaults fall through to `Field.__get__`.
+
+_field_get = Field.__dict__['__get__']
+_fast_field_classes = {}
+_MISSING = object()  # stored NULL values must still read as stored
+
+# what Field.__get__ reads through the field, which the specialized getters read directly
+_FAST_GET_ATTRIBUTES = tuple((name, Field.__dict__[name])
+                             for name in ('__get__', 'unbox', 'name', 'default', 'nullable'))
+
+
+def _nullable_get(self, instance, instance_type):
+    if instance is None:
+        return _field_get(self, instance, instance_type)
+    val = instance.__dict__.get(self._name, _MISSING)
+    if val is _MISSING:
+        default = self._default
+        if default is NULL or self._cache_default is not None:
+            return _field_get(self, instance, instance_type)
+        return default() if callable(default) else default
+    return val
+
+
+def _non_nullable_get(self, instance, instance_type):
+    if instance is None:
+        return _field_get(self, instance, instance_type)
+    val = instance.__dict__.get(self._name, _MISSING)
+    if val is _MISSING:
+        default = self._default
+        if default is NULL or self._cache_default is not None:
+            return _field_get(self, instance, instance_type)
+        val = default() if callable(default) else default
+    if val is None:
+        # means the "tricky edge case" was activated in __delete__
+        raise AttributeError("The {0} field has been deleted.".format(self._name))
+    return val
+
+
+def _fast_field_class(field_class, nullable):
+    if (getattr(field_class, '_fast_get', False)
+            or any(_resolve(field_class, name) is not attribute
+                   for name, attribute in _FAST_GET_ATTRIBUTES)):
+        return None
+    return type(field_class)(field_class.__name__, (field_class, ),
+                             {'__get__': _nullable_get if nullable else _non_nullable_get,
+                              '__module__': field_class.__module__,
+                              '__doc__': field_class.__doc__, '_fast_get': True})
+
+
+def _specialize(field):
+    key = (type(field), field.nullable)
+    try:
+        fast_class = _fast_field_classes[key]
+    except KeyError:
+        fast_class = _fast_field_class(*key)
+        # while instrumentation has patched __get__, a field class only looks ineligible
+        if fast_class is not None or not instrumentation_enabled():
+            fast_class = _fast_field_classes.setdefault(key, fast_class)
+    if fast_class is not None:
+        field.__class__ = fast_class
+    return field
+
+
 class EntityType(type):
 
     @staticmethod
@@ -695,9 +818,10 @@ class EntityType(type):
                           if not isinstance(value, Field) and not key.startswith('__'))
         entity_subclasses = EntityType.__get_entity_subclasses(bases)
         if entity_subclasses:
-            keys_to_override = [key for key in non_field_keys
-                                if any(isinstance(base.__dict__.get(key), Field)
-                                       for base in entity_subclasses)]
+            inherited_fields = (entity_subclasses[0].__fields__ if len(entity_subclasses) == 1
+                                else frozenset().union(*(base.__fields__
+                                                         for base in entity_subclasses)))
+            keys_to_override = [key for key in non_field_keys if key in inherited_fields]
             dct[KEY_OVERRIDES_MAP] = dict((key, dct.pop(key)) for key in keys_to_override)
         else:
             dct[KEY_OVERRIDES_MAP] = dict()
@@ -707,15 +831,47 @@ class EntityType(type):
     def __init__(cls, name, bases, attr):
         super(EntityType, cls).__init__(name, bases, attr)
 
-        fields = odict()
         _field_sort_key = lambda x: x[1]._order_helper
-        for clz in reversed(type.mro(cls)):
-            clz_fields = ((name, field.set_name(name))
-                          for name, field in iteritems(clz.__dict__)
-                          if isinstance(field, Field))
-            fields.update(sorted(clz_fields, key=_field_sort_key))
-
+        own_fields = sorted(((key, _specialize(field.set_name(key)))
+                             for key, field in iteritems(attr) if isinstance(field, Field)),
+                            key=_field_sort_key)
+        overrides = getattr(cls, KEY_OVERRIDES_MAP)
+        base = bases[0] if len(bases) == 1 and isinstance(bases[0], EntityType) else None
+
+        if base is not None:
+            # single inheritance: the base's fields are already collected, in mro order
+            fields = odict(iteritems(base.__fields__))
+        else:
+            fields = odict()
+            for clz in reversed(cls.__mro__[1:]):
+                fields.update(sorted(((key, field.set_name(key))
+                                      for key, field in iteritems(clz.__dict__)
+                                      if isinstance(field, Field)), key=_field_sort_key))
+        extends_base = base is not None and not any(key in fields for key, _ in own_fields)
+        fields.update(own_fields)
         cls.__fields__ = frozenodict(fields)
+
+        # per-class caches used by Entity methods; when only new fields are added, the base's
+        #   caches are extended rather than rebuilt
+        if extends_base:
+            items = own_fields
+            dump_fields, required_fields = base.__dump_fields__, base.__required_fields__
+            repr_fields = base.__repr_fields__
+        else:
+            items = tuple(iteritems(fields))
+            dump_fields = required_fields = repr_fields = ()
+        cls.__dump_fields__ = dump_fields + tuple(field for _, field in items if field._in_dump)
+        cls.__required_fields__ = required_fields + tuple(key for key, field in items
+                                                          if field._required)
+        cls.__repr_fields__ = repr_fields + tuple(item for item in items if '__' not in item[0])
+        if extends_base and not overrides and not getattr(base, KEY_OVERRIDES_MAP):
+            plan_prefix, plan_items = base.__load_plan__, own_fields
+        else:
+            plan_prefix, plan_items = (), iteritems(fields)
+        cls.__load_plan__ = plan_prefix + tuple((key, field, field._aliases,
+                                                 overrides.get(key, NULL))
+                                                for key, field in plan_items)
+
         if hasattr(cls, '__register__'):
             cls.__register__()
 
@@ -771,74 +927,150 @@ class Entity(object):
 
     @classmethod
     def from_json(cls, json_str):
-        return cls(**json_loads(json_str))
+        return schema_loads(cls, json_str)
+
+    @classmethod
+    def from_binary(cls, data):
+        return binary_decode(cls, data)
+
+    @classmethod
+    def from_msgpack(cls, data):
+        return msgpack_decode(cls, data)
 
     @classmethod
     def load(cls, data_dict):
         return cls(**data_dict)
 
+    @classmethod
+    def view(cls, mapping):
+        """Returns a read-mostly EntityView over `mapping`, without constructing an instance."""
+        return EntityView(cls, mapping)
+
+    @classmethod
+    def load_many(cls, records, lazy_validate=False):
+        """Loads an iterable of dicts into a list of instances.
+
+        Per-class lookups are done once for the whole batch. Classes that don't override
+        `__init__`, `load`, or `__setattr__` are constructed directly from the field
+        descriptors. Otherwise each record goes through `load()`. Records that are already
+        instances pass through unchanged.
+
+        Args:
+            records (iterable): dicts of field values
+            lazy_validate (bool): skip the check for missing required fields that runs after
+                construction; assigned values are always validated
+
+        Raises:
+            BulkValidationError: if any record fails to load; its `errors` are keyed by index
+        """
+        if cls.__can_load_fast():
+            plan, initd_key = cls.__load_plan__, '_{0}__initd'.format(cls.__name__)
+            validate = not (lazy_validate or cls._lazy_validate)
+            load = lambda record: cls.__load_fast(record, plan, initd_key, validate)
+        else:
+            load = cls.load
+        results, errors = [], {}
+        for index, record in enumerate(records):
+            try:
+                results.append(record if isinstance(record, cls) else load(record))
+            except Exception as e:
+                results.append(None)
+                errors[index] = e
+        if errors:
+            raise BulkValidationError(errors, results)
+        return results
+
+    @classmethod
+    def __can_load_fast(cls):
+        return (_resolve(cls, '__init__') is Entity.__dict__['__init__']
+                and _resolve(cls, 'load') is Entity.__dict__['load']
+                and _resolve(cls, '__setattr__') in (object.__dict__['__setattr__'],
+                                                     ImmutableEntity.__dict__['__setattr__']))
+
+    @classmethod
+    def __load_fast(cls, record, plan, initd_key, validate):
+        # mirrors __init__, with the per-field lookups taken from a precomputed plan
+        instance = cls.__new__(cls)
+        for name, field, aliases, override in plan:
+            if name in record:
+                val = record[name]
+            else:
+                alias = next((alias for alias in aliases if alias in record), None)
+                if alias is not None:
+                    val = record[alias]
+                elif override is not NULL:
+                    val = override
+                elif field.required and field.default is NULL:
+                    raise ValidationError(name, msg="{0} requires a {1} field. Instantiated with "
+                                                    "{2}".format(cls.__name__, name, record))
+                else:
+                    continue
+            try:
+                field.__set__(instance, val)
+            except ValidationError:
+                if val is not None or field.required:
+                    raise
+        if validate:
+            instance.validate()
+        instance.__dict__[initd_key] = True
+        return instance
+
+    @classmethod
+    def parallel_load(cls, records, workers=None, chunksize=None):
+        """Loads many records using a process pool. See :mod:`auxlib.parallel`."""
+        return parallel_load(cls, records, workers, chunksize)
+
+    @classmethod
+    def parallel_dump(cls, entities, workers=None, chunksize=None):
+        """Dumps many entities using a process pool. See :mod:`auxlib.parallel`."""
+        return parallel_dump(entities, workers, chunksize)
+
     def validate(self):
         # TODO: here, validate should only have to determine if the required keys are set
         try:
-            reduce(lambda _, name: getattr(self, name),
-                   (name for name, field in iteritems(self.__fields__) if field.required)
-                   )
-        except TypeError as e:
-            if str(e) == "reduce() of empty sequence with no initial value":
-                pass
+            for name in self.__required_fields__:
+                getattr(self, name)
         except AttributeError as e:
             raise ValidationError(None, msg=e)
 
     def __repr__(self):
-        def _valid(key):
-            # TODO: re-enable once aliases are implemented
-            # if key.startswith('_'):
-            #     return False
-            if '__' in key:
-                return False
-            try:
-                getattr(self, key)
-                return True
-            except AttributeError:
-                return False
-
-        def _val(key):
-            val = getattr(self, key)
-            return repr(val.value) if isinstance(val, Enum) else repr(val)
-
-        def _sort_helper(key):
-            field = self.__fields__.get(key)
-            return field._order_helper if field is not None else -1
-
-        kwarg_str = ", ".join("{0}={1}".format(key, _val(key))
-                              for key in sorted(self.__dict__, key=_sort_helper)
-                              if _valid(key))
-        return "{0}({1})".format(self.__class__.__name__, kwarg_str)
+        dct, cls = self.__dict__, self.__class__
+        kwarg_str = ", ".join("{0}={1}".format(name, _repr_value(field.unbox(self, cls, val)))
+                              for name, field, val in ((name, field, dct.get(name, NULL))
+                                                       for name, field in cls.__repr_fields__)
+                              if val is not NULL and (val is not None or field.nullable))
+        return "{0}({1})".format(cls.__name__, kwarg_str)
 
     @classmethod
     def __register__(cls):
         pass
 
+    @classmethod
+    def json_schema(cls):
+        """JSON Schema document describing this class. See :mod:`auxlib.schema`."""
+        return json_schema(cls)
+
     def json(self, indent=None, separators=None, **kwargs):
         return json_dumps(self, indent=indent, separators=separators, cls=DumpEncoder, **kwargs)
 
     def pretty_json(self, indent=2, separators=(',', ': '), **kwargs):
         return self.json(indent=indent, separators=separators, **kwargs)
 
+    def binary(self):
+        """Compact binary encoding of this entity. See :mod:`auxlib.codec`."""
+        return binary_encode(self)
+
+    def msgpack(self):
+        """MessagePack encoding of this entity. See :mod:`auxlib.codec`."""
+        return msgpack_encode(self)
+
     def dump(self):
         return odict((field.name, field.dump(self, self.__class__, value))
                      for field, value in ((field, getattr(self, field.name, NULL))
-                                          for field in self.__dump_fields())
+                                          for field in self.__dump_fields__)
                      if value is not NULL and not (value is field.default
                                                    and not field.default_in_dump))
 
-    @classmethod
-    def __dump_fields(cls):
-        if '__dump_fields_cache' not in cls.__dict__:
-            cls.__dump_fields_cache = tuple(field for field in itervalues(cls.__fields__)
-                                            if field.in_dump)
-        return cls.__dump_fields_cache
-
     def __eq__(self, other):
         if self.__class__ != other.__class__:
             return False
@@ -849,10 +1081,342 @@ class Entity(object):
     def __hash__(self):
         return sum(hash(getattr(self, field, None)) for field in self.__fields__)
 
+    def diff(self, other):
+        """Returns the changes that turn this entity into `other`.
+
+        Stored field values are compared directly, skipping values shared by both entities.
+        ComposableField values and equal-length ListField(Entity) values of the same classes are
+        diffed recursively, so only the changed nested fields are recorded.
+
+        Returns:
+            EntityPatch: falsy if the two entities hold the same values
+        """
+        if other.__class__ is not self.__class__:
+            raise ValidationError(None, msg="Cannot diff {0} against {1}"
+                                            "".format(self.__class__.__name__,
+                                                      other.__class__.__name__))
+        patch = EntityPatch(self.__class__)
+        mine, theirs = self.__dict__, other.__dict__
+        for name, field in iteritems(self.__fields__):
+            old, new = mine.get(name, NULL), theirs.get(name, NULL)
+            if old is new:
+                continue
+            elif new is NULL:
+                patch.removed.append(name)
+            elif isinstance(old, Entity) and isinstance(field, ComposableField):
+                if old.__class__ is new.__class__:
+                    nested = old.diff(new)
+                    if nested:
+                        patch.nested[name] = nested
+                else:
+                    patch.set[name] = new
+            elif (isinstance(field, ListField) and _is_entity_sequence(old)
+                  and _is_entity_sequence(new) and len(old) == len(new)
+                  and all(o.__class__ is n.__class__ for o, n in zip(old, new))):
+                items = odict((q, item) for q, item in ((q, o.diff(n)) for q, (o, n)
+                                                        in enumerate(zip(old, new)) if o is not n)
+                              if item)
+                if items:
+                    patch.items[name] = items
+            elif old != new:
+                patch.set[name] = new
+        return patch
+
+    def apply_patch(self, patch):
+        """Returns a new entity with the changes from `patch` applied.
+
+        Changed values are validated. Unchanged values are carried over as is.
+        """
+        if patch.entity_class is not self.__class__:
+            raise ValidationError(None, msg="Cannot apply a {0} patch to {1}"
+                                            "".format(patch.entity_class.__name__,
+                                                      self.__class__.__name__))
+        entity = self.__class__.__new__(self.__class__)
+        dct = entity.__dict__
+        dct.update(self.__dict__)
+        for name, value in iteritems(patch.set):
+            field = self.__fields__[name]
+            if value is None and not field.nullable and not field.required:
+                # the masked state Field.__delete__ stores for a non-nullable field
+                dct[name] = None
+            else:
+                dct[name] = field.validate(entity, value)
+        for name in patch.removed:
+            field = self.__fields__[name]
+            if field.required and field.default is NULL:
+                raise ValidationError(name, msg="The {0} field is required and cannot be "
+                                                "removed.".format(name))
+            dct.pop(name, None)
+        for name, nested in iteritems(patch.nested):
+            if not isinstance(dct.get(name), Entity):
+                raise ValidationError(name, msg="No {0} entity to apply a nested patch to."
+                                                "".format(name))
+            dct[name] = dct[name].apply_patch(nested)
+        for name, items in iteritems(patch.items):
+            values = list(dct.get(name) or ())
+            if not all(q < len(values) and isinstance(values[q], Entity) for q in items):
+                raise ValidationError(name, msg="No {0} entities to apply item patches to."
+                                                "".format(name))
+            for q, item in iteritems(items):
+                values[q] = values[q].apply_patch(item)
+            dct[name] = self.__fields__[name].type(values)
+        return entity
+
     @property
     def _initd(self):
         return getattr(self, '_{0}__initd'.format(self.__class__.__name__), None)
 
+    def __reduce_ex__(self, protocol):
+        return _rebuild_entity, (self.__class__, self.__getstate__())
+
+    def __getstate__(self):
+        # state is (field values in __fields__ order, initd flag, non-field attributes or None)
+        #   with NULL standing in for unset fields
+        dct = self.__dict__
+        initd_key = '_{0}__initd'.format(self.__class__.__name__)
+        values = tuple(dct.get(name, NULL) for name in self.__fields__)
+        extra = (None if len(dct) - (initd_key in dct) == sum(1 for v in values if v is not NULL)
+                 else dict((key, value) for key, value in iteritems(dct)
+                           if key not in self.__fields__ and key != initd_key))
+        return values, dct.get(initd_key, False), extra
+
+    def __setstate__(self, state):
+        # values were validated before pickling; write them straight to __dict__ so that
+        #   immutable entities and fields can be restored
+        values, initd, extra = state
+        dct = self.__dict__
+        dct.update((name, value) for name, value in zip(self.__fields__, values)
+                   if value is not NULL)
+        if extra:
+            dct.update(extra)
+        if initd:
+            dct['_{0}__initd'.format(self.__class__.__name__)] = True
+
+
+REPR_MAX_ITEMS = 10
+
+
+def _repr_value(val):
+    if isinstance(val, Enum):
+        return repr(val.value)
+    elif isinstance(val, (list, tuple)) and len(val) > REPR_MAX_ITEMS:
+        opener, closer = ('[', ']') if isinstance(val, list) else ('(', ')')
+        return "{0}{1}, ...<{2} more>{3}".format(
+            opener, ", ".join(repr(v) for v in val[:REPR_MAX_ITEMS]),
+            len(val) - REPR_MAX_ITEMS, closer)
+    elif isinstance(val, Mapping) and len(val) > REPR_MAX_ITEMS:
+        keys = tuple(k for k, _ in zip(val, range(REPR_MAX_ITEMS)))
+        return "{{{0}, ...<{1} more>}}".format(
+            ", ".join("{0!r}: {1!r}".format(k, val[k]) for k in keys),
+            len(val) - REPR_MAX_ITEMS)
+    return repr(val)
+
+
+def _rebuild_entity(cls, state):
+    instance = cls.__new__(cls)
+    instance.__setstate__(state)
+    return instance
+
+
+def _is_entity_sequence(value):
+    return isinstance(value, (list, tuple)) and all(isinstance(v, Entity) for v in value)
+
+
+class EntityPatch(object):
+    """The changes between two instances of an Entity class, as returned by `Entity.diff()`.
+
+    Attributes:
+        entity_class (type): the Entity class the patch applies to
+        set (OrderedDict): field name to new value
+        removed (list): names of fields that are no longer set
+        nested (OrderedDict): ComposableField name to the EntityPatch for its value
+        items (OrderedDict): ListField name to an OrderedDict of list index to EntityPatch
+    """
+
+    def __init__(self, entity_class, set=None, removed=None, nested=None, items=None):
+        self.entity_class = entity_class
+        self.set = odict() if set is None else set
+        self.removed = [] if removed is None else removed
+        self.nested = odict() if nested is None else nested
+        self.items = odict() if items is None else items
+
+    def __bool__(self):
+        return bool(self.set or self.removed or self.nested or self.items)
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def __eq__(self, other):
+        return (isinstance(other, EntityPatch) and self.entity_class is other.entity_class
+                and self.dump() == other.dump())
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{0}({1}, set={2!r}, removed={3!r}, nested={4!r}, items={5!r})".format(
+            self.__class__.__name__, self.entity_class.__name__, dict(self.set),
+            self.removed, dict(self.nested), dict((k, dict(v)) for k, v in iteritems(self.items)))
+
+    def dump(self):
+        """Returns the patch as plain, json-serializable data.
+
+        Values in ``set`` are dumped with their fields, as `Entity.dump()` would dump them.
+        """
+        fields, cls = self.entity_class.__fields__, self.entity_class
+        result = odict()
+        if self.set:
+            result['set'] = odict((name, None if value is None
+                                   else fields[name].dump(None, cls, value))
+                                  for name, value in iteritems(self.set))
+        if self.removed:
+            result['removed'] = list(self.removed)
+        if self.nested:
+            result['nested'] = odict((name, patch.dump())
+                                     for name, patch in iteritems(self.nested))
+        if self.items:
+            result['items'] = odict((name, odict((text_type(q), patch.dump())
+                                                 for q, patch in iteritems(items)))
+                                    for name, items in iteritems(self.items))
+        return result
+
+
+class EntityView(object):
+    """A lightweight proxy giving field access to a raw mapping, as returned by `Entity.view()`.
+
+    Nothing is copied or validated up front. Each field is looked up in the mapping, by name or
+    alias, the first time it's read. It's then boxed and validated, and falls back to the
+    field's default the same way an Entity attribute would. Assignments and deletions are kept
+    in the view, and the underlying mapping is never modified.
+
+    `dump()` returns the original mapping as long as the view hasn't been changed. After a
+    change, the view is materialized with `to_entity()` and its dump is returned.
+
+    Examples:
+        >>> class Car(Entity):
+        ...     make = StringField(aliases=('manufacturer', ))
+        ...     wheels = IntField(default=4)
+        >>> doc = {'manufacturer': 'acme', 'payload': list(range(10000))}
+        >>> car = Car.view(doc)
+        >>> car.make, car.wheels
+        ('acme', 4)
+        >>> car.dump() is doc
+        True
+        >>> car.wheels = 3
+        >>> car.dump()
+        OrderedDict([('make', 'acme'), ('wheels', 3)])
+
+    """
+    __slots__ = ('_entity_class', '_mapping', '_values', '_changed')
+
+    def __init__(self, entity_class, mapping):
+        object.__setattr__(self, '_entity_class', entity_class)
+        object.__setattr__(self, '_mapping', mapping)
+        object.__setattr__(self, '_values', {})
+        object.__setattr__(self, '_changed', set())
+
+    def __field(self, name):
+        try:
+            return self._entity_class.__fields__[name]
+        except KeyError:
+            raise AttributeError("{0} has no field {1}".format(self._entity_class.__name__, name))
+
+    def __load(self, name, field):
+        cls, mapping = self._entity_class, self._mapping
+        if name in mapping:
+            val = mapping[name]
+        else:
+            alias = next((alias for alias in field._aliases if alias in mapping), None)
+            if alias is not None:
+                val = mapping[alias]
+            elif name in getattr(cls, KEY_OVERRIDES_MAP):
+                val = getattr(cls, KEY_OVERRIDES_MAP)[name]
+            else:
+                return NULL
+        try:
+            return field.validate(None, field.box(None, cls, val))
+        except ValidationError:
+            # like Entity.__init__, an explicit None leaves an optional field unset
+            if val is not None or field.required:
+                raise
+            return NULL
+
+    def __getattr__(self, name):
+        field = self.__field(name)
+        values = self._values
+        try:
+            val = values[name]
+        except KeyError:
+            val = values[name] = self.__load(name, field)
+        if val is NULL:
+            if field.default is NULL:
+                raise AttributeError("A value for {0} has not been set".format(name))
+            val = (maybecall(field.default) if field._cache_default is None
+                   else field._cached_default(None, self._entity_class))
+            if field._cache_default == 'instance':
+                # kept in the view, as an Entity keeps it on the instance
+                values[name] = val
+        if val is None and not field.nullable:
+            raise AttributeError("The {0} field has been deleted.".format(name))
+        return field.unbox(None, self._entity_class, val)
+
+    def __check_mutable(self, field):
+        if issubclass(self._entity_class, ImmutableEntity):
+            raise AttributeError("Assignment not allowed. {0} is immutable."
+                                 .format(self._entity_class.__name__))
+        elif field.immutable:
+            raise AttributeError("The {0} field is immutable.".format(field.name))
+
+    def __setattr__(self, name, value):
+        field = self.__field(name)
+        self.__check_mutable(field)
+        self._values[name] = field.validate(None, field.box(None, self._entity_class, value))
+        self._changed.add(name)
+
+    def __delattr__(self, name):
+        field = self.__field(name)
+        self.__check_mutable(field)
+        if field.required:
+            raise AttributeError("The {0} field is required and cannot be deleted."
+                                 .format(name))
+        # same masking rules as Field.__delete__
+        self._values[name] = NULL if field.nullable else None
+        self._changed.add(name)
+
+    def __repr__(self):
+        return "{0}.view({1!r})".format(self._entity_class.__name__, self._mapping)
+
+    @property
+    def mutated(self):
+        return bool(self._changed)
+
+    def to_entity(self):
+        """Constructs and returns a full instance of the viewed Entity class."""
+        if not self._changed:
+            return self._entity_class(**self._mapping)
+        fields = self._entity_class.__fields__
+        kwargs, deleted = dict(self._mapping), []
+        for name in self._changed:
+            for key in (name, ) + tuple(fields[name]._aliases):
+                kwargs.pop(key, None)
+            val = self._values[name]
+            if val is None and not fields[name].nullable:
+                deleted.append(name)
+            elif val is not NULL:
+                kwargs[name] = val
+        entity = self._entity_class(**kwargs)
+        for name in deleted:
+            delattr(entity, name)
+        return entity
+
+    def dump(self):
+        return self.to_entity().dump() if self._changed else self._mapping
+
+    def json(self, indent=None, separators=None, **kwargs):
+        return json_dumps(self, indent=indent, separators=separators, cls=DumpEncoder, **kwargs)
+
 
 class ImmutableEntity(Entity):
 
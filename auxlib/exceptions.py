@@ -48,6 +48,31 @@ class ValidationError(AuxlibError, TypeError):
             super(ValidationError, self).__init__("{0} must be of type {1}, not {2}"
                                                   "".format(key, valid_types, repr(value)))
 
+    def __reduce__(self):
+        # the default reduction would re-run the formatted message through the `key` argument
+        return self.__class__, (None, None, None, str(self)), self.__dict__
+
+
+class BulkValidationError(ValidationError):
+    """Raised when one or more records of a bulk operation fail.
+
+    Attributes:
+        errors (dict): maps the index of each failed record to the exception it raised
+        results (list): results in input order, with None at the index of each failed record
+    """
+
+    def __init__(self, errors, results=None):
+        self.errors = errors
+        self.results = results
+        first = min(errors)
+        super(BulkValidationError, self).__init__(
+            None, msg="{0} of {1} records failed. First failure at index {2}: {3}"
+                      "".format(len(errors), len(results) if results is not None else '?',
+                                first, errors[first]))
+
+    def __reduce__(self):
+        return self.__class__, (self.errors, self.results)
+
 
 class ThisShouldNeverHappenError(AuxlibError, AttributeError):
     pass
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Optional instrumentation of :mod:`auxlib.entity` field access.
+
+Counts and times `Field.__get__`, `Field.__set__`, and `Field.dump` calls, keyed by entity class
+and field name. Instrumentation is off by default. Nothing is patched until :func:`enable` is
+called, so there is no overhead when it's disabled. :func:`disable` restores the original methods.
+
+Field classes are patched when :func:`enable` is called. Field subclasses defined afterward are
+not instrumented until :func:`enable` is called again. That includes the specialized fast-read
+Field subclasses that :mod:`auxlib.entity` generates when an Entity class is created.
+
+Examples:
+    >>> from auxlib.entity import Entity, IntField
+    >>> class Point(Entity):
+    ...     x = IntField()
+    ...     y = IntField(default=0)
+    >>> point = Point(x=1)
+    >>> enable()
+    >>> point.x + point.x
+    2
+    >>> point.y = 4
+    >>> stats = snapshot()['auxlib.instrumentation.Point']
+    >>> stats['x']['get']['count'], stats['y']['set']['count']
+    (2, 1)
+    >>> disable(); reset()
+
+"""
+from __future__ import absolute_import, division, print_function
+
+from logging import INFO, getLogger
+from threading import Event, Lock, Thread
+from timeit import default_timer
+
+from .logz import DumpEncoder
+
+log = getLogger(__name__)
+
+__all__ = ["enable", "disable", "is_enabled", "reset", "snapshot", "log_snapshot",
+           "start_periodic_log"]
+
+_encode = DumpEncoder(sort_keys=True, separators=(',', ':')).encode
+
+_lock = Lock()
+_stats = {}  # (entity class, field name, operation) -> [count, total seconds]
+_patched = {}  # (field class, method name) -> original method
+
+
+def _record(entity_class, field, operation, elapsed):
+    key = (entity_class, getattr(field, '_name', None), operation)
+    with _lock:
+        try:
+            stat = _stats[key]
+        except KeyError:
+            stat = _stats[key] = [0, 0.0]
+        stat[0] += 1
+        stat[1] += elapsed
+
+
+def _instrument_get(method):
+    def __get__(self, instance, instance_type):
+        start = default_timer()
+        try:
+            return method(self, instance, instance_type)
+        finally:
+            _record(instance_type, self, 'get', default_timer() - start)
+    return __get__
+
+
+def _instrument_set(method):
+    def __set__(self, instance, val):
+        start = default_timer()
+        try:
+            return method(self, instance, val)
+        finally:
+            _record(instance.__class__, self, 'set', default_timer() - start)
+    return __set__
+
+
+def _instrument_dump(method):
+    def dump(self, instance, instance_type, val):
+        start = default_timer()
+        try:
+            return method(self, instance, instance_type, val)
+        finally:
+            _record(instance_type, self, 'dump', default_timer() - start)
+    return dump
+
+
+_INSTRUMENTERS = (
+    ('__get__', _instrument_get),
+    ('__set__', _instrument_set),
+    ('dump', _instrument_dump),
+)
+
+
+def _field_classes():
+    from .entity import Field
+    seen, stack = [], [Field]
+    while stack:
+        cls = stack.pop()
+        if cls not in seen:
+            seen.append(cls)
+            stack.extend(cls.__subclasses__())
+    return seen
+
+
+def enable():
+    """Patches all currently defined Field classes to collect access statistics."""
+    with _lock:
+        for cls in _field_classes():
+            for method_name, instrument in _INSTRUMENTERS:
+                if method_name in cls.__dict__ and (cls, method_name) not in _patched:
+                    original = cls.__dict__[method_name]
+                    _patched[(cls, method_name)] = original
+                    setattr(cls, method_name, instrument(original))
+
+
+def disable():
+    """Restores the original Field methods. Collected statistics are kept until `reset()`."""
+    with _lock:
+        for (cls, method_name), original in list(_patched.items()):
+            setattr(cls, method_name, original)
+        _patched.clear()
+
+
+def is_enabled():
+    return bool(_patched)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    """Returns collected statistics as a nested dict.
+
+    Returns:
+        dict: ``{entity_class_name: {field_name: {operation: {'count': int, 'seconds': float}}}}``
+            where operation is one of 'get', 'set', or 'dump'
+    """
+    with _lock:
+        items = [(key, tuple(stat)) for key, stat in _stats.items()]
+    result = {}
+    for (entity_class, field_name, operation), (count, seconds) in items:
+        class_name = "{0}.{1}".format(entity_class.__module__, entity_class.__name__)
+        field_stats = result.setdefault(class_name, {}).setdefault(field_name, {})
+        field_stats[operation] = {'count': count, 'seconds': seconds}
+    return result
+
+
+def log_snapshot(logger=None, level=INFO):
+    """Logs the current statistics as a single line of compact json."""
+    (logger or log).log(level, "field access stats: %s", _encode(snapshot()))
+
+
+def start_periodic_log(interval=60.0, logger=None, level=INFO):
+    """Starts a daemon thread calling `log_snapshot()` every `interval` seconds.
+
+    Returns:
+        threading.Event: set it to stop the thread
+    """
+    stop = Event()
+
+    def run():
+        while not stop.wait(interval):
+            log_snapshot(logger, level)
+
+    thread = Thread(target=run, name='auxlib-field-stats')
+    thread.daemon = True
+    thread.start()
+    return stop
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Process pool bulk load and dump for :mod:`auxlib.entity` collections.
+
+Records are split into chunks, and each chunk is loaded or dumped in a
+`concurrent.futures.ProcessPoolExecutor` worker. Results are reassembled in input order. Loaded
+entities come back from the workers through the compact `Entity` pickle state. On python 2,
+the `futures` backport package is required for more than one worker.
+
+Errors are collected per record. A failure in one record doesn't stop the rest of the batch.
+When any record fails, a `BulkValidationError` is raised after all chunks finish. Its `errors`
+maps each failed record's index to the exception it raised, and its `results` holds the
+successful results, with None at the failed indexes.
+
+Entity classes must be importable by the worker processes. That means they have to be defined
+at module level, and not inside a function or in ``__main__`` on platforms that spawn workers.
+
+Examples:
+    >>> from auxlib.entity import Entity, IntField
+    >>> class Point(Entity):
+    ...     x = IntField()
+    ...     y = IntField(default=0)
+    >>> points = Point.parallel_load([{'x': 1}, {'x': 2, 'y': 3}], workers=1)
+    >>> points
+    [Point(x=1), Point(x=2, y=3)]
+    >>> [dict(d) for d in Point.parallel_dump(points, workers=1)]
+    [{'x': 1, 'y': 0}, {'x': 2, 'y': 3}]
+    >>> Point.parallel_load([{'x': 1}, {'x': 'two'}], workers=1)
+    Traceback (most recent call last):
+    BulkValidationError: 1 of 2 records failed. First failure at index 1: ...
+
+"""
+from __future__ import absolute_import, division, print_function
+
+from collections import Sequence
+from logging import getLogger
+from multiprocessing import cpu_count
+
+from .compat import iteritems
+from .exceptions import BulkValidationError
+
+log = getLogger(__name__)
+
+__all__ = ["load", "dump"]
+
+CHUNKS_PER_WORKER = 4
+
+
+def _load_chunk(task):
+    entity_class, start, records = task
+    try:
+        return entity_class.load_many(records), {}
+    except BulkValidationError as e:
+        return e.results, dict((start + index, error) for index, error in iteritems(e.errors))
+
+
+def _dump_chunk(task):
+    _, start, entities = task
+    results, errors = [], {}
+    for index, entity in enumerate(entities, start):
+        try:
+            results.append(entity.dump())
+        except Exception as e:
+            results.append(None)
+            errors[index] = e
+    return results, errors
+
+
+def _run(worker, entity_class, items, workers, chunksize):
+    items = items if isinstance(items, Sequence) else list(items)
+    workers = workers or cpu_count()
+    chunksize = chunksize or max(1, -(-len(items) // (workers * CHUNKS_PER_WORKER)))
+    tasks = [(entity_class, start, items[start:start + chunksize])
+             for start in range(0, len(items), chunksize)]
+
+    if workers == 1 or len(tasks) <= 1:
+        chunk_results = [worker(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            chunk_results = list(executor.map(worker, tasks))
+
+    results, errors = [], {}
+    for chunk, chunk_errors in chunk_results:
+        results.extend(chunk)
+        errors.update(chunk_errors)
+    if errors:
+        raise BulkValidationError(errors, results)
+    return results
+
+
+def load(entity_class, records, workers=None, chunksize=None):
+    """Loads an iterable of dicts into a list of `entity_class` instances using a process pool.
+
+    Args:
+        entity_class (type): an Entity subclass; each chunk is loaded with
+            `entity_class.load_many`
+        records (iterable): dicts of field values
+        workers (int): number of worker processes; defaults to the number of CPUs. With one
+            worker, or a single chunk, records are loaded in the calling process.
+        chunksize (int): records per task sent to a worker; by default the records are split
+            into about four chunks per worker
+
+    Returns:
+        list: entities in the same order as `records`
+
+    Raises:
+        BulkValidationError: if any record fails to load
+    """
+    return _run(_load_chunk, entity_class, records, workers, chunksize)
+
+
+def dump(entities, workers=None, chunksize=None):
+    """Calls `dump()` on each of a sequence of entities using a process pool.
+
+    Arguments are the same as for `load()`.
+
+    Returns:
+        list: dumped dicts in the same order as `entities`
+
+    Raises:
+        BulkValidationError: if any entity fails to dump
+    """
+    return _run(_dump_chunk, None, entities, workers, chunksize)
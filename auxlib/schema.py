@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""JSON Schema export and generation for :mod:`auxlib.entity` classes.
+
+`json_schema()`, or `Entity.json_schema()`, builds a draft-04 JSON Schema document from an
+Entity class's `__fields__`. Each field maps to a property:
+  - BooleanField, IntegerField, NumberField, StringField: the matching json type
+  - DateField: a string with the date-time format
+  - EnumField: an enum of the Enum members' values, which is what `dump()` writes
+  - ComposableField, and ListField with an Entity element type: a `$ref` into `definitions`
+  - ListField: an array, with items typed by the element type when it's known
+  - MapField: an object
+
+Nullable fields also accept null. Fields that are required and have no default are listed as
+required. Non-callable defaults are included in their dumped form.
+
+`loads()`, which `Entity.from_json()` uses, parses a json document and constructs the entity
+from it. Nested objects are boxed by their fields, by position in the document.
+
+`entity_from_schema()` goes the other way, generating an Entity class from a schema document,
+such as one written by `json_schema()` or loaded from yaml. Generated classes are memoized by a
+hash of the schema, and their compiled source can be cached on disk for warm starts.
+
+Examples:
+    >>> from auxlib.entity import ComposableField, Entity, IntField, ListField, StringField
+    >>> class Wheel(Entity):
+    ...     size = IntField(default=17)
+    >>> class Car(Entity):
+    ...     name = StringField()
+    ...     wheels = ListField(Wheel, default=())
+    ...     spare = ComposableField(Wheel, nullable=True, required=False)
+    >>> schema = Car.json_schema()
+    >>> schema['required']
+    ['name']
+    >>> schema['properties']['wheels']['items'], schema['properties']['wheels']['default']
+    ({'$ref': '#/definitions/Wheel'}, [])
+    >>> schema['properties']['spare']
+    {'anyOf': [{'$ref': '#/definitions/Wheel'}, {'type': 'null'}]}
+    >>> car = Car.from_json('{"name": "roadster", "wheels": [{"size": 18}, {}]}')
+    >>> car.wheels
+    (Wheel(size=18), Wheel())
+
+"""
+from __future__ import absolute_import, division, print_function
+
+import ast
+import marshal
+import re
+import sys
+from collections import Mapping
+from datetime import datetime
+from hashlib import sha1
+from json import dumps as json_dumps, loads as json_loads
+from keyword import iskeyword
+from logging import getLogger
+from os import fdopen, makedirs, rename
+from os.path import dirname, isdir, join
+from tempfile import mkstemp
+from threading import Lock
+from types import ModuleType
+
+from enum import Enum
+
+from . import NULL
+from .compat import integer_types, iteritems, odict, string_types
+from .exceptions import ValidationError
+
+log = getLogger(__name__)
+
+__all__ = ["json_schema", "loads", "entity_from_schema", "entity_source"]
+
+SCHEMA_URI = "http://json-schema.org/draft-04/schema#"
+
+
+def _plain(value):
+    """Reduce a dumped default value to types the json module can encode."""
+    if isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, Mapping):
+        return dict((k, _plain(v)) for k, v in iteritems(value))
+    elif isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _is_entity_class(value):
+    from .entity import Entity
+    return isinstance(value, type) and issubclass(value, Entity)
+
+
+def _type_schema(types):
+    """Schema for a python type or tuple of types, as given for a ListField element type."""
+    types = types if isinstance(types, tuple) else (types, )
+    if all(issubclass(t, bool) for t in types):
+        return {'type': 'boolean'}
+    elif all(issubclass(t, integer_types) and not issubclass(t, bool) for t in types):
+        return {'type': 'integer'}
+    elif all(issubclass(t, integer_types + (float, )) for t in types):
+        return {'type': 'number'}
+    elif all(issubclass(t, string_types) for t in types):
+        return {'type': 'string'}
+    elif all(issubclass(t, datetime) for t in types):
+        return odict((('type', 'string'), ('format', 'date-time')))
+    elif len(types) == 1 and issubclass(types[0], Enum):
+        return {'enum': [member.value for member in types[0]]}
+    return {}
+
+
+def _definition_ref(entity_class, definitions, names):
+    name = entity_class.__name__
+    if names.get(name, entity_class) is not entity_class:
+        name = "{0}.{1}".format(entity_class.__module__, entity_class.__name__)
+    if name not in names:
+        names[name] = entity_class
+        definitions[name] = _entity_schema(entity_class, definitions, names)
+    return {'$ref': '#/definitions/{0}'.format(name)}
+
+
+def _nullable(schema):
+    if 'type' in schema:
+        schema['type'] = [schema['type'], 'null']
+    elif 'enum' in schema:
+        schema['enum'] = schema['enum'] + [None]
+    elif schema:
+        schema = {'anyOf': [schema, {'type': 'null'}]}
+    return schema
+
+
+def _field_schema(field, default, definitions, names):
+    from .entity import (BooleanField, ComposableField, DateField, EnumField, IntegerField,
+                         ListField, MapField, NumberField, StringField)
+    if isinstance(field, BooleanField):
+        schema = {'type': 'boolean'}
+    elif isinstance(field, IntegerField):
+        schema = {'type': 'integer'}
+    elif isinstance(field, NumberField):
+        schema = {'type': 'number'}
+    elif isinstance(field, StringField):
+        schema = {'type': 'string'}
+    elif isinstance(field, (DateField, EnumField)):
+        schema = _type_schema(field.type)
+    elif isinstance(field, ComposableField):
+        schema = _definition_ref(field.type, definitions, names)
+    elif isinstance(field, ListField):
+        element_type = field._element_type
+        schema = odict((('type', 'array'),
+                        ('items', _definition_ref(element_type, definitions, names)
+                         if _is_entity_class(element_type) else _type_schema(element_type))))
+    elif isinstance(field, MapField):
+        schema = {'type': 'object'}
+    else:
+        schema = {}
+
+    if field.nullable:
+        schema = _nullable(schema)
+    if default is not NULL and not callable(default) and '$ref' not in schema:
+        schema = odict(schema)
+        schema['default'] = _plain(field.dump(None, None, default))
+    return schema
+
+
+def _field_default(entity_class, name, field):
+    from .entity import KEY_OVERRIDES_MAP
+    overrides = getattr(entity_class, KEY_OVERRIDES_MAP)
+    if name in overrides:
+        return field.box(None, entity_class, overrides[name])
+    return field.default
+
+
+def _entity_schema(entity_class, definitions, names):
+    properties, required = odict(), []
+    for name, field in iteritems(entity_class.__fields__):
+        default = _field_default(entity_class, name, field)
+        properties[name] = _field_schema(field, default, definitions, names)
+        if field.required and default is NULL:
+            required.append(name)
+    schema = odict((('title', entity_class.__name__), ('type', 'object'),
+                    ('properties', properties)))
+    if required:
+        schema['required'] = required
+    return schema
+
+
+def json_schema(entity_class):
+    """Returns a JSON Schema (draft-04) document describing an Entity class.
+
+    Nested Entity classes are described once each under ``definitions``, and referenced with
+    ``$ref``.
+
+    Returns:
+        OrderedDict: a document ready for `json.dumps()`
+    """
+    definitions, names = odict(), {entity_class.__name__: entity_class}
+    schema = odict((('$schema', SCHEMA_URI), ))
+    schema.update(_entity_schema(entity_class, definitions, names))
+    if definitions:
+        schema['definitions'] = definitions
+    return schema
+
+
+def loads(entity_class, json_str):
+    """Parses a json document into an instance of `entity_class`."""
+    return entity_class(**json_loads(json_str))
+
+
+# ##########################################
+# entity generation
+# ##########################################
+
+_GENERATOR_VERSION = 3
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_DEFINITION_PREFIX = '#/definitions/'
+_NULL_SCHEMA = {'type': 'null'}
+
+_FIELD_CLASSES = {
+    'boolean': 'BooleanField',
+    'integer': 'IntField',
+    'number': 'NumberField',
+    'string': 'StringField',
+    'object': 'MapField',
+}
+
+_ELEMENT_TYPES = {
+    'array': '(list, tuple)',
+    'boolean': 'bool',
+    'integer': 'integer_types',
+    'number': 'integer_types + (float, )',
+    'object': 'Mapping',
+    'string': 'string_types',
+}
+
+_SOURCE_HEADER = """\
+# generated by auxlib.schema.entity_from_schema
+from __future__ import absolute_import, division, print_function
+
+from collections import Mapping
+
+from enum import Enum
+
+from auxlib.compat import integer_types, string_types
+from auxlib.entity import (BooleanField, ComposableField, DateField, Entity, EntityType,
+                           EnumField, IntField, ListField, MapField, NumberField, StringField)
+"""
+
+# names the generated source already binds or reads, which generated classes must not shadow
+_RESERVED_NAMES = frozenset(['__entity__', '__name__'] + [
+    alias.asname or alias.name for node in ast.parse(_SOURCE_HEADER).body
+    if isinstance(node, ast.ImportFrom) for alias in node.names])
+
+
+def _unsupported(schema, msg):
+    return ValidationError(None, msg="{0}: {1}".format(msg, json_dumps(schema, sort_keys=True)))
+
+
+def _without_null(schema):
+    """Returns (schema without its null alternative, whether null was allowed)."""
+    type_ = schema.get('type')
+    if isinstance(type_, list) and 'null' in type_:
+        others = [t for t in type_ if t != 'null']
+        return dict(schema, type=others[0] if len(others) == 1 else others), True
+    elif None in schema.get('enum', ()):
+        return dict(schema, enum=[v for v in schema['enum'] if v is not None]), True
+    elif _NULL_SCHEMA in schema.get('anyOf', ()) and len(schema['anyOf']) == 2:
+        other = dict(next(s for s in schema['anyOf'] if s != _NULL_SCHEMA))
+        other.update((k, v) for k, v in iteritems(schema) if k != 'anyOf')
+        return other, True
+    return schema, False
+
+
+class _SourceWriter(object):
+    """Writes python source defining the Entity classes, and Enums, described by a schema."""
+
+    def __init__(self, schema):
+        self.definitions = schema.get('definitions', {})
+        self.lines = [_SOURCE_HEADER]
+        self.names = set(_RESERVED_NAMES)
+        self.refs = {}
+        self.pending = set()
+        self.lines.append("__entity__ = {0}\n".format(self.entity(schema, 'GeneratedEntity')))
+
+    def name(self, title):
+        base = re.sub(r'\W', '_', title) or '_'
+        if not _IDENTIFIER.match(base) or iskeyword(base):
+            base = '_' + base
+        name, count = base, 1
+        while name in self.names:
+            count += 1
+            name = "{0}_{1}".format(base, count)
+        self.names.add(name)
+        return name
+
+    def ref(self, ref):
+        key = ref[len(_DEFINITION_PREFIX):]
+        if not ref.startswith(_DEFINITION_PREFIX) or key not in self.definitions:
+            raise ValidationError(None, msg="Unresolvable $ref {0}".format(ref))
+        try:
+            return self.refs[key]
+        except KeyError:
+            if key in self.pending:
+                raise ValidationError(None, msg="Recursive $ref {0}".format(ref))
+            self.pending.add(key)
+            return self.refs.setdefault(key, self.entity(self.definitions[key],
+                                                         key.rpartition('.')[2]))
+
+    def entity(self, schema, title):
+        title = str(schema.get('title', title))
+        required = set(schema.get('required', ()))
+        fields = [(name, self.field(prop, name in required, title + name[:1].upper() + name[1:]))
+                  for name, prop in iteritems(schema.get('properties', {}))]
+        name = self.name(title)
+        # named for the module attribute holding it, so it can be pickled
+        self.lines.append("{0} = EntityType({0!r}, (Entity, ), {{".format(name))
+        self.lines.append("    '__module__': __name__,")
+        self.lines.extend("    {0!r}: {1},".format(str(key), field) for key, field in fields)
+        self.lines.append("})\n")
+        return name
+
+    def enum(self, values, title):
+        members = [(value if isinstance(value, string_types) and _IDENTIFIER.match(value)
+                    and not iskeyword(value) else "member_{0}".format(q), value)
+                   for q, value in enumerate(values)]
+        name = self.name(title)
+        self.lines.append("{0} = Enum({1!r}, {2!r}, module=__name__)\n"
+                          "".format(name, name, [(str(k), v) for k, v in members]))
+        return name
+
+    def element_type(self, schema, title):
+        if '$ref' in schema:
+            return self.ref(schema['$ref'])
+        elif 'properties' in schema:
+            return self.entity(schema, title)
+        return _ELEMENT_TYPES.get(schema.get('type'), 'object')
+
+    def field(self, schema, required, title):
+        schema, nullable = _without_null(schema)
+        type_ = schema.get('type')
+        if '$ref' in schema:
+            field_class, args = 'ComposableField', [self.ref(schema['$ref'])]
+        elif 'enum' in schema:
+            field_class, args = 'EnumField', [self.enum(schema['enum'], title)]
+        elif type_ == 'object' and 'properties' in schema:
+            field_class, args = 'ComposableField', [self.entity(schema, title)]
+        elif type_ == 'string' and schema.get('format') == 'date-time':
+            field_class, args = 'DateField', []
+        elif type_ == 'array':
+            field_class, args = 'ListField', [self.element_type(schema.get('items', {}), title)]
+        elif isinstance(type_, string_types) and type_ in _FIELD_CLASSES:
+            field_class, args = _FIELD_CLASSES[type_], []
+        else:
+            raise _unsupported(schema, "No Field class for schema")
+
+        if 'default' in schema:
+            args.append("default={0!r}".format(schema['default']))
+        elif not required:
+            args.append("required=False")
+        if nullable:
+            args.append("nullable=True")
+        return "{0}({1})".format(field_class, ", ".join(args))
+
+
+def entity_source(schema):
+    """Returns python source defining an Entity class for a JSON Schema document.
+
+    The source is what `entity_from_schema()` compiles. Its ``__entity__`` global is the
+    generated class.
+    """
+    return "\n".join(_SourceWriter(schema).lines)
+
+
+def _schema_key(schema):
+    canonical = json_dumps(schema, sort_keys=True, separators=(',', ':'))
+    return sha1("{0}:{1}".format(_GENERATOR_VERSION, canonical).encode('utf-8')).hexdigest()
+
+
+def _cache_path(cache_dir, key):
+    implementation = getattr(sys, 'implementation', None)
+    tag = implementation.cache_tag if implementation else "py{0}{1}".format(*sys.version_info)
+    return join(cache_dir, "entity-{0}.{1}.marshal".format(key, tag))
+
+
+def _read_code(path):
+    try:
+        with open(path, 'rb') as fh:
+            return marshal.load(fh)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_code(path, code):
+    try:
+        if not isdir(dirname(path)):
+            makedirs(dirname(path))
+        fd, temp_path = mkstemp(dir=dirname(path))
+        with fdopen(fd, 'wb') as fh:
+            marshal.dump(code, fh)
+        rename(temp_path, path)
+    except (IOError, OSError) as e:
+        log.debug("unable to cache generated entity code at %s: %r", path, e)
+
+
+_generated = {}
+_generated_lock = Lock()
+
+
+def entity_from_schema(schema, cache_dir=None):
+    """Returns an Entity class generated from a JSON Schema document.
+
+    Properties map to Field classes the way `json_schema()` writes them, so the two round-trip.
+    Additionally, an object with ``properties`` becomes a nested Entity class. Array items that
+    aren't a ``$ref`` or an object with ``properties`` are checked only by their json type.
+    Properties listed in ``required`` are required, properties that allow null are nullable, and
+    ``default`` values are boxed by the field like any other default.
+
+    Generated classes are memoized by a hash of the schema, so calling this again with an equal
+    schema returns the same class. With `cache_dir`, the compiled module is also written there,
+    and read back on later runs instead of being generated again. Like ``__pycache__``,
+    `cache_dir` must only be writable by trusted users.
+
+    Raises:
+        ValidationError: when a property's schema has no matching Field class, or a ``$ref``
+            can't be resolved
+    """
+    key = _schema_key(schema)
+    with _generated_lock:
+        try:
+            return _generated[key]
+        except KeyError:
+            pass
+
+        path = cache_dir and _cache_path(cache_dir, key)
+        code = path and _read_code(path)
+        if code is None:
+            code = compile(entity_source(schema), "<entity schema {0}>".format(key), 'exec')
+            if path:
+                _write_code(path, code)
+
+        module = ModuleType("{0}.generated_{1}".format(__name__, key))
+        exec(code, module.__dict__)
+        sys.modules[module.__name__] = module
+        return _generated.setdefault(key, module.__entity__)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Watch files for changes from a background thread.
+
+A :class:`FileWatcher` calls its callback with the set of watched paths that changed. On Linux,
+changes are reported by inotify, through ctypes. Elsewhere, or if inotify can't be set up, file
+mtimes, sizes, and inodes are polled instead. Both notice a watched path whose symlink, or a
+symlinked directory it resolves through, is swapped to a new target, as Kubernetes does when
+it updates a mounted ConfigMap.
+
+Changes are debounced. After a change, the watcher waits until nothing else has changed for
+`debounce` seconds, and then calls the callback once for everything that changed in between.
+Editors and deploy tools often write a file in several steps, or replace it by renaming a new
+file over it; each of those is reported as a single change.
+
+Examples:
+    >>> from tempfile import NamedTemporaryFile
+    >>> from threading import Event
+    >>> changed = Event()
+    >>> with NamedTemporaryFile('w') as fh:
+    ...     watcher = FileWatcher([fh.name], lambda paths: changed.set(), interval=0.05,
+    ...                           debounce=0.05).start()
+    ...     _ = fh.write('hello'); fh.flush()
+    ...     changed.wait(5)
+    ...     watcher.stop()
+    True
+
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import struct
+import sys
+from errno import EAGAIN, EINTR
+from logging import getLogger
+from os.path import abspath, basename, dirname, realpath
+from select import select
+from threading import Event, Thread
+from timeit import default_timer
+
+log = getLogger(__name__)
+
+__all__ = ["FileWatcher"]
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE)
+
+_EVENT = struct.Struct('iIII')  # struct inotify_event, without its trailing name
+
+
+def _libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+        return libc
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+class _Inotify(object):
+    """Watches the directories holding `paths`, since files are often replaced, not written.
+
+    The directories of symlink targets are watched too. Any other event in a watched directory,
+    such as a symlink the path resolves through being swapped, is checked by comparing the
+    path's `stat` signature.
+    """
+
+    def __init__(self, libc, paths):
+        import ctypes
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.names = {}  # watch descriptor -> {file name: set of paths}
+        self.paths = {}  # watch descriptor -> set of paths with something in that directory
+        self.signatures = dict((path, _Poller.signature(path)) for path in paths)
+        try:
+            for path in paths:
+                self.add(path)
+        except OSError:
+            self.close()
+            raise
+
+    def add(self, path):
+        import ctypes
+        for entry in set((path, realpath(path))):
+            directory = dirname(entry)
+            wd = self.libc.inotify_add_watch(self.fd,
+                                             directory.encode(sys.getfilesystemencoding()),
+                                             WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_add_watch failed for " + directory)
+            self.names.setdefault(wd, {}).setdefault(basename(entry), set()).add(path)
+            self.paths.setdefault(wd, set()).add(path)
+
+    def wait(self, timeout):
+        try:
+            if not select([self.fd], [], [], timeout)[0]:
+                return set()
+            data = os.read(self.fd, 64 * 1024)
+        except (IOError, OSError) as e:
+            if e.errno in (EAGAIN, EINTR):
+                return set()
+            raise
+        changed, check, offset = set(), set(), 0
+        while offset + _EVENT.size <= len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            paths = self.names.get(wd, {}).get(name.decode(sys.getfilesystemencoding()))
+            if paths:
+                changed.update(paths)
+            else:
+                check.update(self.paths.get(wd, ()))
+        for path in changed | check:
+            signature = _Poller.signature(path)
+            if path in check and path not in changed and signature == self.signatures[path]:
+                continue
+            self.signatures[path] = signature
+            changed.add(path)
+            try:
+                self.add(path)  # its symlink may now resolve into another directory
+            except OSError as e:
+                log.debug("unable to watch the new target of %s: %r", path, e)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _Poller(object):
+
+    def __init__(self, paths, stop):
+        self.stop = stop
+        self.signatures = dict((path, self.signature(path)) for path in paths)
+
+    @staticmethod
+    def signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size, st.st_ino
+
+    def wait(self, timeout):
+        self.stop.wait(timeout)
+        changed = set()
+        for path, signature in self.signatures.items():
+            current = self.signature(path)
+            if current != signature:
+                self.signatures[path] = current
+                changed.add(path)
+        return changed
+
+    def close(self):
+        pass
+
+
+class FileWatcher(object):
+    """Calls `callback` from a daemon thread with the set of `paths` that changed.
+
+    Args:
+        paths (iter): files to watch; they don't need to exist yet
+        callback (callable): called with a set of absolute paths
+        interval (float): seconds between polls, or with inotify, between checks for `stop()`
+        debounce (float): seconds without further changes to wait before calling `callback`
+        use_inotify (bool): set False to always poll
+
+    """
+
+    def __init__(self, paths, callback, interval=1.0, debounce=0.25, use_inotify=True):
+        self.paths = frozenset(abspath(path) for path in paths)
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.backend = None
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        libc = _libc() if self.use_inotify else None
+        if libc is not None:
+            try:
+                self.backend = _Inotify(libc, self.paths)
+            except OSError as e:
+                log.info("inotify unavailable, polling instead: %r", e)
+        if self.backend is None:
+            self.backend = _Poller(self.paths, self._stop)
+        self._thread = Thread(target=self._run, name='auxlib-file-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        pending, last_change = set(), None
+        try:
+            while not self._stop.is_set():
+                changed = self.backend.wait(self.debounce if pending else self.interval)
+                if changed:
+                    pending |= changed
+                    last_change = default_timer()
+                elif pending and default_timer() - last_change >= self.debounce:
+                    paths, pending = pending, set()
+                    if not self._stop.is_set():
+                        self._notify(paths)
+        finally:
+            self.backend.close()
+
+    def _notify(self, paths):
+        try:
+            self.callback(paths)
+        except Exception:
+            log.exception("file watcher callback failed for %s", sorted(paths))
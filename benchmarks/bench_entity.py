@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmarks for auxlib.entity.
+
+Times construction, attribute get/set, dump(), json(), from_json(), a pickle round trip, repr(),
+diff(), __eq__ and __hash__ for small, medium, and wide (200-field) entities, plus a nested
+ComposableField/ListField graph. Also times creating a subclass of the wide entity class.
+
+Usage:
+    python benchmarks/bench_entity.py                         # print results
+    python benchmarks/bench_entity.py --save baseline.json    # record a baseline
+    python benchmarks/bench_entity.py --compare baseline.json --threshold 0.25
+
+When comparing, the exit status is 1 if any benchmark is slower than its baseline by more than
+`threshold` (a fraction; 0.25 means 25% slower).
+"""
+from __future__ import absolute_import, division, print_function
+
+from argparse import ArgumentParser
+from datetime import datetime
+from json import dump as json_dump, load as json_load
+import os
+from pickle import HIGHEST_PROTOCOL, dumps as pickle_dumps, loads as pickle_loads
+import platform
+import sys
+from timeit import Timer
+
+from enum import Enum
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auxlib.compat import integer_types, string_types  # NOQA
+from auxlib.entity import (BooleanField, ComposableField, DateField, Entity, EnumField,  # NOQA
+                           IntField, ListField, MapField, NumberField, StringField)
+
+WIDE_FIELD_COUNT = 200
+NESTED_LIST_LENGTH = 25
+
+
+class Color(Enum):
+    blue = 0
+    black = 1
+    red = 2
+
+
+class SmallEntity(Entity):
+    name = StringField()
+    count = IntField(default=0)
+    active = BooleanField(default=True)
+
+
+class MediumEntity(Entity):
+    name = StringField()
+    description = StringField(required=False)
+    count = IntField(default=0)
+    weight = NumberField(required=False)
+    ratio = NumberField(default=1.0)
+    active = BooleanField(default=True)
+    color = EnumField(Color)
+    created = DateField()
+    tags = ListField(string_types, default=())
+    scores = ListField(integer_types, required=False)
+    attributes = MapField(required=False)
+    owner = StringField(nullable=True, required=False)
+
+
+def _make_wide_entity_class():
+    dct = dict(('int_{0:03d}'.format(q), IntField(default=q))
+               for q in range(WIDE_FIELD_COUNT // 2))
+    dct.update(('str_{0:03d}'.format(q), StringField(default='s{0}'.format(q)))
+               for q in range(WIDE_FIELD_COUNT - len(dct)))
+    dct['__module__'] = __name__
+    return type('WideEntity', (Entity, ), dct)
+
+
+WideEntity = _make_wide_entity_class()
+
+
+class Part(Entity):
+    sku = StringField()
+    quantity = IntField(default=1)
+    color = EnumField(Color, default=Color.black)
+
+
+class Assembly(Entity):
+    name = StringField()
+    primary = ComposableField(Part)
+    parts = ListField(Part)
+
+
+class Product(Entity):
+    name = StringField()
+    assembly = ComposableField(Assembly)
+    spares = ListField(Part, default=())
+
+
+def small_kwargs():
+    return dict(name='widget', count=12, active=False)
+
+
+def medium_kwargs():
+    return dict(name='widget', description='a medium sized widget', count=12, weight=12.5,
+                color='red', created=datetime(2016, 3, 23, 10, 44, 12), tags=['a', 'b', 'c'],
+                scores=[1, 2, 3, 4])
+
+
+def wide_kwargs():
+    return dict((name, field.default + 1 if isinstance(field, IntField) else field.default + 'x')
+                for name, field in WideEntity.__fields__.items())
+
+
+def nested_kwargs():
+    parts = [dict(sku='sku-{0}'.format(q), quantity=q, color=q % 3)
+             for q in range(NESTED_LIST_LENGTH)]
+    return dict(name='product',
+                assembly=dict(name='assembly', primary=dict(sku='primary'), parts=parts),
+                spares=parts[:5])
+
+
+SHAPES = (
+    ('small', SmallEntity, small_kwargs, 'count'),
+    ('medium', MediumEntity, medium_kwargs, 'weight'),
+    ('wide', WideEntity, wide_kwargs, 'int_042'),
+    ('nested', Product, nested_kwargs, 'name'),
+)
+
+
+def build_benchmarks():
+    """Returns an ordered tuple of (name, callable) pairs."""
+    benchmarks = []
+    for shape, cls, make_kwargs, attr_name in SHAPES:
+        kwargs = make_kwargs()
+        instance = cls(**kwargs)
+        other = cls(**make_kwargs())
+        json_str = instance.json()
+        value = getattr(instance, attr_name)
+
+        benchmarks.extend((
+            ('{0}.construct'.format(shape), lambda cls=cls, kwargs=kwargs: cls(**kwargs)),
+            ('{0}.getattr'.format(shape),
+             lambda instance=instance, attr_name=attr_name: getattr(instance, attr_name)),
+            ('{0}.setattr'.format(shape),
+             lambda instance=instance, attr_name=attr_name, value=value:
+                 setattr(instance, attr_name, value)),
+            ('{0}.dump'.format(shape), instance.dump),
+            ('{0}.json'.format(shape), instance.json),
+            ('{0}.from_json'.format(shape),
+             lambda cls=cls, json_str=json_str: cls.from_json(json_str)),
+            ('{0}.pickle'.format(shape),
+             lambda instance=instance: pickle_loads(pickle_dumps(instance, HIGHEST_PROTOCOL))),
+            ('{0}.repr'.format(shape), lambda instance=instance: repr(instance)),
+            ('{0}.diff'.format(shape),
+             lambda instance=instance, other=other: instance.diff(other)),
+            ('{0}.eq'.format(shape), lambda instance=instance, other=other: instance == other),
+            ('{0}.hash'.format(shape), lambda instance=instance: hash(instance)),
+        ))
+    benchmarks.append(('wide.subclass',
+                       lambda: type('WideSubclass', (WideEntity, ), {'extra': IntField()})))
+    return tuple(benchmarks)
+
+
+def time_callable(func, repeat=5, min_time=0.2):
+    """Returns the best observed per-call time for `func` in microseconds."""
+    timer = Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time / repeat or number >= 10 ** 6:
+            break
+        number *= 10
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def run(name_filter=None, repeat=5, min_time=0.2):
+    results = {}
+    for name, func in build_benchmarks():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_callable(func, repeat, min_time)
+        print("{0:<24} {1:>12.3f} usec".format(name, results[name]))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compares results to baseline timings.
+
+    Returns:
+        list: (name, baseline_usec, current_usec, ratio) for each benchmark slower than
+            `threshold` allows
+    """
+    regressions = []
+    print("\n{0:<24} {1:>12} {2:>12} {3:>8}".format('benchmark', 'baseline', 'current', 'ratio'))
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        ratio = results[name] / baseline[name]
+        flag = ' !!' if ratio > 1 + threshold else ''
+        print("{0:<24} {1:>12.3f} {2:>12.3f} {3:>8.2f}{4}".format(name, baseline[name],
+                                                                 results[name], ratio, flag))
+        if flag:
+            regressions.append((name, baseline[name], results[name], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--save', metavar='PATH', help="write results to a baseline json file")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="compare results to a baseline json file")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline (default: 0.25)")
+    parser.add_argument('--filter', metavar='SUBSTRING', help="only run matching benchmarks")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="approximate seconds spent timing each benchmark")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json_dump({'python': platform.python_version(),
+                       'implementation': platform.python_implementation(),
+                       'results': results}, fh, indent=2, sort_keys=True)
+        print("\nsaved baseline to {0}".format(args.save))
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json_load(fh)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n{0} benchmark(s) regressed more than {1:.0%}:".format(len(regressions),
+                                                                         args.threshold))
+            for name, _, _, ratio in regressions:
+                print("  {0}: {1:.2f}x".format(name, ratio))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
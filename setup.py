@@ -64,6 +64,7 @@ setup(
     # tests_require=["tox"],
     extras_require={
         'crypt': ["pycrypto"],
+        'msgpack': ["msgpack>=1.0"],
         'yaml': ["pyyaml"],
     },
     cmdclass={
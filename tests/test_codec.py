@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from datetime import datetime, timedelta
+from unittest import SkipTest, TestCase
+
+from enum import Enum
+
+from auxlib import codec
+from auxlib._vendor.boltons.timeutils import UTC, ConstantTZInfo
+from auxlib.codec import decode, encode
+from auxlib.compat import integer_types, string_types
+from auxlib.entity import (BooleanField, ComposableField, DateField, Entity, EnumField, IntField,
+                           ListField, MapField, NumberField, StringField)
+from auxlib.exceptions import ValidationError
+
+
+class Color(Enum):
+    red = 'red'
+    green = 'green'
+    blue = 'blue'
+
+
+class Part(Entity):
+    sku = StringField()
+    quantity = IntField(default=1)
+    color = EnumField(Color, required=False)
+
+
+class Everything(Entity):
+    boolean = BooleanField()
+    integer = IntField()
+    big = IntField(default=2 ** 62)
+    negative = IntField(default=-300)
+    number = NumberField()
+    string = StringField()
+    date = DateField()
+    aware_date = DateField(required=False)
+    color = EnumField(Color, default=Color.green)
+    strings = ListField(string_types, default=())
+    numbers = ListField(integer_types, required=False)
+    mapping = MapField(required=False)
+    part = ComposableField(Part)
+    parts = ListField(Part, default=())
+    nullable = StringField(required=False, nullable=True)
+    hidden = IntField(default=5, in_dump=False)
+    quiet = IntField(default=6, default_in_dump=False)
+    optional = StringField(required=False)
+
+
+def make_everything(**kwargs):
+    values = dict(
+        boolean=True, integer=42, number=3.5, string=u'mäple',
+        date=datetime(2016, 3, 23, 1, 2, 3, 4),
+        aware_date=datetime(2016, 3, 23, 1, 2, 3,
+                            tzinfo=ConstantTZInfo(offset=-timedelta(hours=7))),
+        strings=['a', 'b'], numbers=[1, -2, 3], mapping={'a': {'b': [1, 2.5, None]}},
+        part=Part(sku='p1', color='red'), parts=[{'sku': 'p2'}, Part(sku='p3', quantity=9)],
+    )
+    values.update(kwargs)
+    return Everything(**dict((k, v) for k, v in values.items() if v is not NOT_GIVEN))
+
+
+NOT_GIVEN = object()
+
+
+class BinaryCodecTests(TestCase):
+
+    def test_round_trip(self):
+        everything = make_everything(big=2 ** 70)
+        data = encode(everything)
+        assert isinstance(data, bytes)
+        decoded = decode(Everything, data)
+        assert decoded == everything
+        assert decoded.dump() == everything.dump()
+        assert decoded.aware_date.utcoffset() == timedelta(hours=-7)
+        assert decoded.parts[1].quantity == 9
+        assert decoded.big == 2 ** 70
+
+    def test_entity_methods(self):
+        everything = make_everything(number=1+2j)
+        assert Everything.from_binary(everything.binary()) == everything
+
+    def test_smaller_than_json(self):
+        everything = make_everything(mapping=NOT_GIVEN)
+        assert len(everything.binary()) < len(everything.json()) / 2
+
+    def test_null_versus_missing(self):
+        everything = make_everything()
+        assert 'nullable' not in Everything.from_binary(everything.binary()).dump()
+
+        everything.nullable = None
+        decoded = Everything.from_binary(everything.binary())
+        assert decoded.nullable is None
+        assert decoded.dump()['nullable'] is None
+
+    def test_dump_semantics(self):
+        everything = make_everything(hidden=50, quiet=60)
+        decoded = Everything.from_binary(everything.binary())
+        # not in_dump, so not encoded
+        assert decoded.hidden == 5
+        assert decoded.quiet == 60
+
+        decoded = Everything.from_binary(make_everything().binary())
+        assert decoded.quiet == 6
+        self.assertRaises(AttributeError, lambda: decoded.optional)
+
+    def test_deleted_field(self):
+        everything = make_everything(optional='here')
+        del everything.optional
+        decoded = Everything.from_binary(everything.binary())
+        self.assertRaises(AttributeError, lambda: decoded.optional)
+
+    def test_bad_data(self):
+        data = bytearray(make_everything().binary())
+        data[0] = 99
+        self.assertRaises(ValidationError, Everything.from_binary, bytes(data))
+        self.assertRaises(ValidationError, Part.from_binary, make_everything().binary())
+
+    def test_truncated_data(self):
+        data = make_everything().binary()
+        for length in range(len(data)):
+            self.assertRaises(ValidationError, Everything.from_binary, data[:length])
+        self.assertRaises(ValidationError, Part.from_binary, b'\x01\xff')
+
+
+class MsgpackTests(TestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, codec, '_msgpack_backend', codec._msgpack_backend)
+
+    def backends(self):
+        backends = [codec._UMsgpack()]
+        if hasattr(codec._msgpack, 'Timestamp'):
+            backends.append(codec._CMsgpack(codec._msgpack))
+        return backends
+
+    def round_trip(self):
+        everything = make_everything(date=datetime(2016, 3, 23, 1, 2, 3, 4, tzinfo=UTC))
+        data = everything.msgpack()
+        decoded = Everything.from_msgpack(data)
+        assert decoded == everything
+        # timestamps carry no utc offset
+        assert decoded.aware_date.utcoffset() == timedelta(0)
+        assert decoded.parts[1].quantity == 9
+        assert decoded.mapping['a']['b'] == (1, 2.5, None)
+        return data
+
+    def test_round_trip_c_extension(self):
+        if not hasattr(codec._msgpack, 'Timestamp'):
+            raise SkipTest("msgpack>=1.0 is not installed")
+        codec._msgpack_backend = codec._CMsgpack(codec._msgpack)
+        self.round_trip()
+
+    def test_round_trip_vendored(self):
+        codec._msgpack_backend = codec._UMsgpack()
+        self.round_trip()
+
+    def test_backends_agree(self):
+        if not hasattr(codec._msgpack, 'Timestamp'):
+            raise SkipTest("msgpack>=1.0 is not installed")
+        codec._msgpack_backend = codec._UMsgpack()
+        data = self.round_trip()
+        codec._msgpack_backend = codec._CMsgpack(codec._msgpack)
+        assert Everything.from_msgpack(data) == Everything.from_msgpack(self.round_trip())
+
+    def test_timestamps(self):
+        for backend in self.backends():
+            codec._msgpack_backend = backend
+            for value in (datetime(2016, 3, 23), datetime(2016, 3, 23, 1, 2, 3, 999999),
+                          datetime(1901, 1, 1, 0, 0, 1), datetime(2600, 1, 1, 0, 0, 0, 1)):
+                everything = make_everything(date=value)
+                decoded = Everything.from_msgpack(codec.msgpack_encode(everything))
+                # naive datetimes are encoded as utc and come back naive
+                assert decoded.date == value and decoded.date.tzinfo is None
+                assert decoded == everything
+
+    def test_naive_timestamp_ext(self):
+        wire = codec._umsgpack.unpackb(make_everything().msgpack())
+        assert sorted(wire) == sorted(make_everything().dump())
+        assert wire['date'].type == 1
+        assert isinstance(wire['aware_date'], datetime)
+
+    def test_malformed_data(self):
+        data = make_everything().msgpack()
+        for backend in self.backends():
+            codec._msgpack_backend = backend
+            for bad in (data[:len(data) // 2], b'\xc1', b'\x81\xa4part\x01',
+                        backend.packb({1: 2}), backend.packb({'sku': 'a', 'parts': [1]})):
+                self.assertRaises(ValidationError, Everything.from_msgpack, bad)
+
+    def test_null_versus_missing(self):
+        everything = make_everything()
+        assert 'nullable' not in Everything.from_msgpack(everything.msgpack()).dump()
+        everything.nullable = None
+        assert Everything.from_msgpack(everything.msgpack()).nullable is None
+
+    def test_not_a_map(self):
+        self.assertRaises(ValidationError, Part.from_msgpack, codec._msgpack_backend.packb([1]))
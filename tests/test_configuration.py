@@ -1,13 +1,26 @@
-from unittest import TestCase
+from json import dumps as json_dumps, loads as json_loads
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
+from time import sleep
+from timeit import default_timer
+from unittest import TestCase, skipIf
 
 import os
+import signal
 
 from ddt import ddt, unpack, data
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
 import auxlib.configuration
-from auxlib.configuration import make_env_key, Configuration, reverse_env_key, YamlSource
+from auxlib.configuration import (make_env_key, Configuration, reverse_env_key, Source,
+                                  YamlSource)
 from auxlib.exceptions import AssignmentError, NotFoundError
-from auxlib.type_coercion import typify
+from auxlib.type_coercion import TypeCoercionError, typify
 
 
 APP_NAME = 'test'
@@ -155,3 +168,404 @@ class BasicConfigTests(TestCase):
     def test_config_no_sources_required_params(self):
         required_parameters = ('beta', 'theta')
         self.assertRaises(EnvironmentError, Configuration(APP_NAME, required_parameters=required_parameters).verify)
+
+
+class DictSource(Source):
+
+    def __init__(self, items):
+        self.data = items
+
+    def load(self):
+        return dict(self.data)
+
+
+class SnapshotConfigTests(TestCase):
+
+    def setUp(self):
+        self.source = DictSource({'count': 1, 'name': 'one',
+                                  'additional_requirements': 'count'})
+        self.config = Configuration('snapshottest', self.source)
+
+    def tearDown(self):
+        for key in ('count', 'name', 'other'):
+            self.config.unset_env(key)
+
+    def test_reload_swaps_snapshot(self):
+        snapshot = self.config._snapshot
+        self.source.data = {'count': 2, 'name': 'two'}
+        self.config._reload(force=True)
+        assert self.config._snapshot is not snapshot
+        assert (self.config.count, self.config.name) == (2, 'two')
+        assert snapshot.values['count'] == 1  # old snapshot is untouched
+
+    def test_failed_reload_keeps_configuration(self):
+        self.source.data = {'name': 'two'}
+        self.assertRaises(EnvironmentError, self.config._reload, True)
+        assert (self.config.count, self.config.name) == (1, 'one')
+        self.source.data = {'count': 3}
+        self.config._reload(True)
+        assert self.config.count == 3
+
+    def test_env_typed_from_sources(self):
+        self.config.set_env('count', '7')
+        assert self.config['COUNT'] == 7
+        assert self.config._config_map['count'] == 1
+        self.config.unset_env('count')
+        assert self.config.count == 1
+
+    def test_env_typing_error_raised_on_read(self):
+        self.config.set_env('count', 'many')
+        assert 'count' in list(self.config)
+        self.assertRaises(TypeCoercionError, lambda: self.config.count)
+        assert self.config.name == 'one'
+
+    def test_env_read_only_on_set_env_and_reload(self):
+        self.config.set_env('name', 'env')
+        os.environ[make_env_key('snapshottest', 'name')] = 'changed'
+        os.environ[make_env_key('snapshottest', 'other')] = '5'
+        self.config.set_env('count', 'many')
+        self.config.append_sources(DictSource({'extra': True}))
+        assert (self.config.name, self.config.get('other')) == ('env', None)
+        self.config.set_env('count', '2')  # fixes the override that couldn't be typed
+        assert self.config.count == 2
+        assert self.config._reload() == set(['name', 'other'])
+        assert (self.config.name, self.config.other, self.config.count) == ('changed', 5, 2)
+
+    def test_items(self):
+        self.config.set_env('other', '2.5')
+        assert dict(self.config.items()) == {'count': 1, 'name': 'one', 'other': 2.5}
+        assert sorted(self.config) == ['count', 'name', 'other']
+        self.config.set_env('count', 'many')
+        self.assertRaises(TypeCoercionError, dict, self.config.items())
+
+    def test_snapshot(self):
+        self.config.set_env('other', '2.5')
+        frozen = self.config.snapshot()
+        assert frozen['count'] == 1 and frozen.name == 'one' and frozen.other == 2.5
+        assert self.config.snapshot() is frozen
+        assert not hasattr(frozen, '__setitem__')
+
+        self.config.set_env('count', '3')
+        assert frozen.count == 1
+        assert self.config.snapshot().count == 3
+
+    def test_snapshot_resolves_eagerly(self):
+        self.config.set_env('count', 'many')
+        self.assertRaises(TypeCoercionError, self.config.snapshot)
+        self.config.unset_env('count')
+        self.config.append_required('missing')
+        self.assertRaises(EnvironmentError, self.config.snapshot)
+
+    def test_reads_during_reload(self):
+        errors = []
+
+        def read():
+            for _ in range(5000):
+                try:
+                    self.config.count
+                except Exception as e:
+                    errors.append(e)
+
+        readers = [Thread(target=read) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        for q in range(200):
+            self.source.data = {'count': q}
+            self.config._reload(True)
+        for thread in readers:
+            thread.join()
+        assert errors == []
+        assert self.config.count == 199
+
+
+@skipIf(not hasattr(signal, 'SIGHUP'), "SIGHUP is not available")
+class SighupTests(TestCase):
+
+    def setUp(self):
+        # so the handler under test doesn't chain to those of every other Configuration
+        self.addCleanup(signal.signal, signal.SIGHUP,
+                        signal.signal(signal.SIGHUP, signal.SIG_DFL))
+        self.source = DictSource({'count': 1})
+        self.config = Configuration('sighuptest', self.source)
+
+    def wait_for(self, condition):
+        start = default_timer()
+        while not condition() and default_timer() - start < 5:
+            sleep(0.01)
+        return condition()
+
+    def test_reload_waits_for_updates_in_progress(self):
+        self.source.data = {'count': 2}
+        with self.config._lock:
+            os.kill(os.getpid(), signal.SIGHUP)
+            sleep(0.1)
+            assert self.config.count == 1  # not reloaded in the middle of this update
+        assert self.wait_for(lambda: self.config.count == 2)
+
+    def test_reloads_continue_after_failure(self):
+        self.source.data = {}
+        self.config.append_required('count')
+        os.kill(os.getpid(), signal.SIGHUP)
+        sleep(0.1)
+        assert self.config.count == 1
+        self.source.data = {'count': 3}
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert self.wait_for(lambda: self.config.count == 3)
+
+
+class CountingSource(DictSource):
+
+    def __init__(self, items):
+        super(CountingSource, self).__init__(items)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return super(CountingSource, self).load()
+
+
+class IncrementalReloadTests(TestCase):
+
+    def setUp(self):
+        self.sources = [CountingSource({'a': 1, 'b': 1}), CountingSource({'b': 2, 'c': 2}),
+                        CountingSource({'c': 3, 'd': 3})]
+        self.config = Configuration('incrementaltest', self.sources)
+        self.merges = []
+        original = self.config._Configuration__merge_source
+
+        def merge_source(source, config_map, force_reload=False):
+            self.merges.append(self.sources.index(source) if source in self.sources else None)
+            return original(source, config_map, force_reload)
+        self.config._Configuration__merge_source = merge_source
+
+    def tearDown(self):
+        self.config.unset_env('ratio')
+
+    def test_merges_from_first_changed_source(self):
+        self.sources[1].data = {'b': 20, 'c': 2, 'e': 5}
+        changed = self.config._reload(True)
+        assert changed == set(['b', 'e'])
+        assert self.merges == [1, 2]
+        assert [source.loads for source in self.sources] == [2, 2, 2]
+        assert (self.config.b, self.config.c, self.config.e) == (20, 3, 5)
+
+    def test_unchanged_sources_not_merged(self):
+        snapshot = self.config._snapshot
+        assert self.config._reload(True) == set()
+        assert self.merges == []
+        assert self.config._config_map is snapshot.config_map
+
+    def test_typed_env_values_kept(self):
+        self.config.set_env('ratio', '0.25')
+        ratio = self.config.ratio
+        self.sources[2].data = {'c': 30}
+        assert self.config._reload(True) == set(['c', 'd'])
+        assert self.config.ratio is ratio
+
+    def test_chain_change_rebuilds(self):
+        self.sources[0].data = {'a': 1, 'additional_sources': [{'CountingSource': {
+            'items': {'f': 6}}}]}
+        auxlib.configuration.CountingSource = CountingSource  # additional sources are looked up
+        try:                                                  # in the module's globals
+            assert self.config._reload(True) == set(['f'])
+        finally:
+            del auxlib.configuration.CountingSource
+        assert self.config.f == 6
+        assert len(self.config._Configuration__sources) == 4
+
+    def test_failed_reload_is_retried(self):
+        self.config.append_required('a')
+        self.sources[0].data = {'b': 1}
+        self.assertRaises(EnvironmentError, self.config._reload, True)
+        assert self.config.a == 1
+        self.sources[0].data = {'a': 10, 'b': 1}
+        assert self.config._reload(True) == set(['a'])
+
+
+class JsonFileSource(Source):
+
+    def __init__(self, path):
+        self._path = path
+        self.loads = 0
+        self.text = None
+
+    @property
+    def path(self):
+        return self._path
+
+    def modified(self):
+        with open(self._path) as fh:
+            return fh.read() != self.text
+
+    def load(self):
+        self.loads += 1
+        with open(self._path) as fh:
+            self.text = fh.read()
+        return json_loads(self.text)
+
+
+class WatchConfigTests(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.first = JsonFileSource(os.path.join(self.directory, 'first.json'))
+        self.second = JsonFileSource(os.path.join(self.directory, 'second.json'))
+        self.write(self.first, {'a': 1, 'b': 1})
+        self.write(self.second, {'b': 2, 'c': 3})
+        self.config = Configuration('watchtest', [self.first, self.second])
+        self.changes = []
+        self.config.on_change(self.changes.append)
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    @staticmethod
+    def write(source, items):
+        with open(source.path, 'w') as fh:
+            fh.write(json_dumps(items))
+
+    def test_reload_sources(self):
+        self.write(self.first, {'a': 10, 'b': 10, 'd': 4})
+        self.write(self.second, {'b': 2})
+        changed = self.config._reload_sources([self.first])
+        assert changed == set(['a', 'd'])
+        assert (self.config.a, self.config.b, self.config.c) == (10, 2, 3)
+        assert (self.first.loads, self.second.loads) == (2, 1)
+        assert self.changes == [changed]
+
+    def test_on_change(self):
+        self.config.set_env('e', '5')
+        self.config.set_env('e', '5')
+        self.config.unset_env('e')
+        assert self.changes == [set(['e']), set(['e'])]
+
+    def test_watch(self):
+        watcher = self.config.watch(interval=0.02, debounce=0.05)
+        try:
+            sleep(0.05)
+            self.write(self.second, {'b': 2, 'c': 30})
+            for _ in range(500):
+                if self.changes:
+                    break
+                sleep(0.01)
+            assert self.changes == [set(['c'])]
+            assert self.config.c == 30
+            assert (self.first.loads, self.second.loads) == (1, 2)
+
+            self.write(self.second, {'b': 2, 'c': 30})  # same content; not reloaded
+            sleep(0.3)
+            assert self.second.loads == 2
+        finally:
+            watcher.stop()
+
+
+class YamlCacheTests(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        self.path = os.path.join(self.directory, 'config.yml')
+        self.write('a: 1\nb: [x, y]\n')
+        self.parses = 0
+        self.parse_yaml = auxlib.configuration._parse_yaml
+
+        def parse_yaml(text):
+            self.parses += 1
+            return self.parse_yaml(text)
+        auxlib.configuration._parse_yaml = parse_yaml
+
+    def tearDown(self):
+        auxlib.configuration._parse_yaml = self.parse_yaml
+        rmtree(self.directory)
+
+    def write(self, text):
+        with open(self.path, 'w') as fh:
+            fh.write(text)
+
+    def load(self):
+        return Configuration('yamlcachetest', YamlSource(self.path, cache_dir=self.cache_dir))
+
+    def test_warm_load_skips_parsing(self):
+        assert self.load().b == ['x', 'y']
+        assert self.parses == 1
+        assert len(os.listdir(self.cache_dir)) == 1
+        config = self.load()
+        assert (config.a, config.b) == (1, ['x', 'y'])
+        assert self.parses == 1
+
+    def test_changed_file_parsed_again(self):
+        self.load()
+        self.write('a: 2\n')
+        assert self.load().a == 2
+        assert self.parses == 2
+        assert self.load().a == 2
+        assert self.parses == 2
+
+    def test_unreadable_cache_ignored(self):
+        self.load()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'wb') as fh:
+                fh.write(b'not a pickle')
+        assert self.load().a == 1
+        assert self.parses == 2
+
+    def test_safe_loader(self):
+        import yaml
+        self.write('a: !!python/object/apply:os.getcwd []\n')
+        self.assertRaises(yaml.YAMLError, self.load)
+
+
+class SlowSource(DictSource):
+
+    def load(self):
+        sleep(0.3)
+        return super(SlowSource, self).load()
+
+
+class AsyncSource(DictSource):
+
+    def aload(self):
+        return asyncio.sleep(0.3, result=dict(self.data))
+
+
+@skipIf(asyncio is None, "asyncio is not available")
+class AsyncLoadTests(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        rmtree(self.directory)
+
+    def aload(self, config, sources):
+        return self.loop.run_until_complete(config.aload(sources, loop=self.loop))
+
+    def test_sources_fetched_concurrently(self):
+        chained = os.path.join(self.directory, 'chained.yml')
+        with open(chained, 'w') as fh:
+            fh.write('b: 4\nd: 4\n')
+        sources = [SlowSource({'a': 1, 'b': 1}),
+                   AsyncSource({'b': 2, 'c': 2,
+                                'additional_sources': [{'YamlSource': {'location': chained}}]}),
+                   SlowSource({'c': 3})]
+        config = Configuration('asynctest')
+        start = default_timer()
+        assert self.aload(config, sources) is config
+        assert default_timer() - start < 0.6
+        assert (config.a, config.b, config.c, config.d) == (1, 4, 3, 4)
+        assert sources[1].dump() == sources[1].data
+
+        synchronous = Configuration('asynctest', sources)
+        assert dict(synchronous.items()) == dict(config.items())
+
+    def test_failed_source(self):
+        config = Configuration('asynctest')
+        source = AsyncSource({'a': 1, 'additional_sources': [{'NoSuchSource': {}}]})
+        self.assertRaises(KeyError, self.aload, config, [DictSource({'b': 2}), source])
+        self.assertRaises(NotFoundError, lambda: config.b)
+
+    def test_no_sources(self):
+        config = Configuration('asynctest')
+        assert self.aload(config, None) is config
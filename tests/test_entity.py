@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
+from copy import deepcopy
 import datetime
 
 from auxlib._vendor.boltons.timeutils import isoparse
 from enum import Enum
+import pickle
 import time
 from unittest import TestCase
 
+from auxlib import NULL
 from auxlib._vendor.six import string_types, integer_types
 from auxlib.entity import (Entity, StringField, IntField, EnumField, ListField,
-                           DateField, BooleanField)
-from auxlib.exceptions import ValidationError
+                           DateField, BooleanField, ImmutableEntity, MapField,
+                           ComposableField, MutableListField)
+from auxlib.exceptions import BulkValidationError, ValidationError
 from auxlib.logz import jsondumps
 
 
@@ -76,6 +80,19 @@ class EntityTests(TestCase):
         se2 = eval(repr(se))
         self.assertEqual(repr(se), repr(se2))
 
+    def test_repr_field_order_and_unset_fields(self):
+        se = SampleEntity(integer_field=28, string_field='bazaar', enum_field=ChooseOne.C)
+        self.assertEqual("SampleEntity(string_field='bazaar', integer_field=28, enum_field='c')",
+                         repr(se))
+        se.list_field = ['a', 'b']
+        self.assertEqual("SampleEntity(string_field='bazaar', integer_field=28, enum_field='c', "
+                         "list_field=('a', 'b'))", repr(se))
+
+    def test_repr_abbreviates_large_lists(self):
+        le = ListEntity(field=[str(q) for q in range(3)], field_w_default=range(25))
+        self.assertEqual("ListEntity(field=('0', '1', '2'), "
+                         "field_w_default=(0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...<15 more>))", repr(le))
+
     def test_create_from_objects(self):
         se = SampleEntity(string_field='bazaar', integer_field=28, enum_field=ChooseOne.A)
         blank = Blank()
@@ -165,6 +182,33 @@ class EntityTests(TestCase):
         self.assertRaises(ValidationError, setattr, dse, 'integer_field_w_default', 14.4)
         self.assertRaises(ValidationError, setattr, dse, 'integer_field', 14.4)
 
+    def test_field_overridden_on_grandchild_class(self):
+        class Child(SampleEntity):
+            pass
+
+        class GrandChild(Child):
+            integer_field = 11
+
+        assert list(GrandChild.__fields__) == list(SampleEntity.__fields__)
+        gc = GrandChild(string_field='bazaar', enum_field=ChooseOne.A)
+        self.assertEqual(11, gc.integer_field)
+        self.assertEqual(11, GrandChild.integer_field)
+
+    def test_class_caches(self):
+        fields = DerivedSampleEntity.__fields__
+        assert DerivedSampleEntity.__dump_fields__ == tuple(fields.values())
+        assert fields['string_field_w_default'] is DerivedSampleEntity.__dict__[
+            'string_field_w_default']
+        assert 'choice' not in DerivedSampleEntity.__required_fields__
+        assert [name for name, _ in DerivedSampleEntity.__repr_fields__] == list(fields)
+
+        class Extended(DerivedSampleEntity):
+            extra = IntField(required=False, in_dump=False)
+
+        assert list(Extended.__fields__) == list(fields) + ['extra']
+        assert Extended.__dump_fields__ == DerivedSampleEntity.__dump_fields__
+        assert Extended.__required_fields__ == DerivedSampleEntity.__required_fields__
+
     def test_entity_fields_list(self):
         fields = DerivedSampleEntity.fields
         assert 'string_field_w_default' in fields
@@ -695,6 +739,398 @@ class BooleanFieldTests(TestCase):
         self.assertRaises(ValidationError, BooleanEntity2)
 
 
+class Counter(object):
+
+    def __init__(self, factory):
+        self.calls = 0
+        self.factory = factory
+
+    def __call__(self):
+        self.calls += 1
+        return self.factory()
+
+
+instance_counter = Counter(list)
+class_counter = Counter(lambda: {'a': [1, 2]})
+
+
+class CachedDefaultEntity(Entity):
+    per_instance = ListField(integer_types, default=instance_counter, cache_default='instance')
+    per_class = MapField(default=class_counter, cache_default='class')
+    uncached = DateField(default=datetime.datetime.now)
+
+
+class CachedDefaultTests(TestCase):
+
+    def test_instance_default_called_once_per_instance(self):
+        start = instance_counter.calls
+        first, second = CachedDefaultEntity(), CachedDefaultEntity()
+        assert first.per_instance == () and first.per_instance is first.per_instance
+        assert second.per_instance is not None
+        assert instance_counter.calls - start == 2
+        assert 'per_instance' in first.__dict__
+        assert first.dump()['per_instance'] == ()
+
+    def test_class_default_is_shared_and_frozen(self):
+        start = class_counter.calls
+        first, second = CachedDefaultEntity(), CachedDefaultEntity()
+        assert first.per_class is second.per_class
+        assert first.per_class['a'] == (1, 2)
+        assert class_counter.calls - start <= 1
+        assert 'per_class' not in first.__dict__
+        assert not hasattr(first.per_class, '__setitem__')
+
+    def test_uncached_default_called_on_every_read(self):
+        entity = CachedDefaultEntity()
+        assert entity.uncached is not entity.uncached
+        assert 'uncached' not in entity.__dict__
+
+    def test_invalid_option(self):
+        self.assertRaises(ValidationError, IntField, default=int, cache_default='forever')
+
+    def test_class_option_rejected_for_mutable_values(self):
+        self.assertRaises(ValidationError, ComposableField, Engine,
+                          default=lambda: Engine(cylinders=4), cache_default='class')
+        self.assertRaises(ValidationError, MutableListField, integer_types, default=list,
+                          cache_default='class')
+        self.assertRaises(ValidationError, ListField, Wheel, default=tuple, cache_default='class')
+        assert ListField(integer_types, default=list, cache_default='class')
+
+    def test_class_default_is_validated(self):
+        values = iter([1, 'two'])
+
+        class Validated(Entity):
+            number = IntField(default=lambda: next(values), cache_default='class')
+
+        self.assertRaises(ValidationError, lambda: Validated().number)
+
+
+class Engine(Entity):
+    cylinders = IntField()
+    fuel = StringField(default='gas')
+
+
+class Wheel(Entity):
+    position = StringField()
+    pressure = IntField(default=32)
+
+
+class Vehicle(Entity):
+    name = StringField()
+    color = EnumField(Color, required=False)
+    built = DateField(required=False)
+    engine = ComposableField(Engine)
+    wheels = ListField(Wheel, default=())
+
+
+def make_vehicle(**kwargs):
+    values = dict(name='truck', engine=Engine(cylinders=8),
+                  wheels=[Wheel(position=p) for p in ('fl', 'fr', 'rl', 'rr')])
+    values.update(kwargs)
+    return Vehicle(**values)
+
+
+class DiffPatchTests(TestCase):
+
+    def test_no_changes(self):
+        vehicle = make_vehicle()
+        assert not vehicle.diff(vehicle)
+        assert not vehicle.diff(make_vehicle())
+
+    def test_set_and_removed(self):
+        old = make_vehicle(color=Color.Red, built=NOW)
+        new = make_vehicle(color='blue')
+        patch = old.diff(new)
+        assert dict(patch.set) == {'color': Color.Blue}
+        assert patch.removed == ['built']
+        assert patch.dump() == {'set': {'color': 'blue'}, 'removed': ['built']}
+        assert old.apply_patch(patch) == new
+
+    def test_nested_changes(self):
+        old = make_vehicle()
+        wheels = list(old.wheels)
+        wheels[2] = Wheel(position='rl', pressure=28)
+        new = make_vehicle(engine=Engine(cylinders=6), wheels=wheels)
+        patch = old.diff(new)
+        assert not patch.set
+        assert dict(patch.nested['engine'].set) == {'cylinders': 6}
+        assert list(patch.items['wheels']) == [2]
+        assert patch.dump()['items'] == {'wheels': {'2': {'set': {'pressure': 28}}}}
+
+        patched = old.apply_patch(patch)
+        assert patched == new
+        assert patched.wheels[0] is old.wheels[0]
+        assert patched.name is old.name
+        assert old.engine.cylinders == 8
+
+    def test_list_length_change_sets_whole_list(self):
+        old = make_vehicle()
+        new = make_vehicle(wheels=old.wheels[:3])
+        patch = old.diff(new)
+        assert list(patch.set) == ['wheels']
+        assert old.apply_patch(patch) == new
+
+    def test_apply_validates_changes(self):
+        patch = make_vehicle().diff(make_vehicle(name='van'))
+        patch.set['name'] = 42
+        self.assertRaises(ValidationError, make_vehicle().apply_patch, patch)
+        patch = make_vehicle().diff(make_vehicle(name='van'))
+        patch.removed.append('name')
+        self.assertRaises(ValidationError, make_vehicle().apply_patch, patch)
+
+    def test_deleted_non_nullable_field(self):
+        class A(Entity):
+            f = StringField(default='x', required=False)
+
+        old, new = A(f='y'), A(f='y')
+        del new.f
+        patch = old.diff(new)
+        assert dict(patch.set) == {'f': None}
+        patched = old.apply_patch(patch)
+        assert patched == new
+        assert patched.dump() == new.dump() == {}
+
+    def test_removed_field_with_default(self):
+        old, new = Engine(cylinders=4, fuel='diesel'), Engine(cylinders=4)
+        patch = old.diff(new)
+        assert patch.removed == ['fuel']
+        patched = old.apply_patch(patch)
+        assert patched == new and patched.fuel == 'gas'
+
+    def test_nested_patch_without_target(self):
+        patch = make_vehicle().diff(make_vehicle(engine=Engine(cylinders=6)))
+        target = make_vehicle()
+        del target.__dict__['engine']
+        self.assertRaises(ValidationError, target.apply_patch, patch)
+        wheels = list(make_vehicle().wheels)
+        wheels[3] = Wheel(position='rr', pressure=20)
+        patch = make_vehicle().diff(make_vehicle(wheels=wheels))
+        self.assertRaises(ValidationError, make_vehicle(wheels=wheels[:2]).apply_patch, patch)
+
+    def test_class_mismatch(self):
+        self.assertRaises(ValidationError, make_vehicle().diff, Engine(cylinders=4))
+        patch = Engine(cylinders=4).diff(Engine(cylinders=6))
+        self.assertRaises(ValidationError, make_vehicle().apply_patch, patch)
+
+
+class LoadManyTests(TestCase):
+
+    def test_matches_constructor(self):
+        records = [dict(string_field='s{0}'.format(q), integer_field=q, enum_field='a',
+                        sf2='aliased') for q in range(5)]
+        records[1]['integer_field_w_default'] = 7
+        entities = SampleEntity.load_many(records)
+        assert entities == [SampleEntity(**r) for r in records]
+        assert entities[0].string_field_w_default == 'aliased'
+        assert entities[1].integer_field_w_default == 7
+        assert all(e._initd for e in entities)
+
+    def test_custom_init_uses_load(self):
+        records = [dict(new_field=q, string_field='s', integer_field=q) for q in range(3)]
+        entities = DerivedSampleEntity.load_many(records)
+        assert [e.new_field for e in entities] == [0, 1, 2]
+        assert entities[0].enum_field == ChooseOne.A
+
+    def test_errors_by_index(self):
+        records = [dict(name='a'), dict(name=['b']), dict(), dict(name='d')]
+        try:
+            ImmutableSampleEntity.load_many(records)
+        except BulkValidationError as e:
+            assert sorted(e.errors) == [1, 2]
+            assert e.results[3].name == 'd'
+        else:
+            self.fail("BulkValidationError not raised")
+
+    def test_lazy_validate(self):
+        class Strict(Entity):
+            name = StringField()
+
+            def validate(self):
+                raise ValidationError('name', msg="validate called")
+
+        self.assertRaises(BulkValidationError, Strict.load_many, [dict(name='a')])
+        entity, = Strict.load_many([dict(name='a')], lazy_validate=True)
+        assert entity.name == 'a'
+
+    def test_list_field_reports_element_index(self):
+        wheels = [dict(position='fl'), dict(position='fr', pressure='flat')]
+        try:
+            make_vehicle(wheels=wheels)
+        except ValidationError as e:
+            assert list(e.errors) == [1]
+        else:
+            self.fail("ValidationError not raised")
+
+
+class EntityViewTests(TestCase):
+
+    def test_field_access(self):
+        doc = dict(string_field='bazaar', integer_field=28, enum_field='b', sf1='aliased')
+        view = SampleEntity.view(doc)
+        assert view.string_field == 'bazaar'
+        assert view.string_field_w_default == 'aliased'
+        assert view.integer_field_w_default == 42
+        assert view.enum_field is ChooseOne.B
+        assert view.list_field == ('alpha', 'beta', 'gamma')
+        self.assertRaises(AttributeError, getattr, view, 'not_a_field')
+        assert view.dump() is doc
+        assert view.to_entity() == SampleEntity(**doc)
+
+    def test_class_overrides_and_missing_fields(self):
+        view = DerivedSampleEntity.view(dict(string_field='bazaar'))
+        assert view.enum_field is ChooseOne.A
+        self.assertRaises(AttributeError, getattr, view, 'new_field')
+
+    def test_instance_cached_default(self):
+        start = instance_counter.calls
+        view = CachedDefaultEntity.view({})
+        assert view.per_instance is view.per_instance
+        assert instance_counter.calls - start == 1
+        assert not view.mutated and view.dump() == {}
+
+    def test_validates_on_access_only(self):
+        view = SampleEntity.view(dict(string_field='bazaar', integer_field='not an int'))
+        assert view.string_field == 'bazaar'
+        self.assertRaises(ValidationError, getattr, view, 'integer_field')
+
+    def test_mutation_is_copy_on_write(self):
+        doc = dict(string_field='bazaar', integer_field=28, enum_field='b', sf1='aliased')
+        view = SampleEntity.view(doc)
+        view.integer_field = 5
+        view.string_field_w_default = 'assigned'
+        assert view.mutated
+        assert doc['integer_field'] == 28 and doc['sf1'] == 'aliased'
+        dump = view.dump()
+        assert dump['integer_field'] == 5
+        assert dump['string_field_w_default'] == 'assigned'
+        self.assertRaises(ValidationError, setattr, view, 'integer_field', 'five')
+
+    def test_delete(self):
+        view = DeletableEntity.view(dict(name='given'))
+        del view.name
+        self.assertRaises(AttributeError, getattr, view, 'name')
+        assert view.dump() == {}
+        self.assertRaises(AttributeError, delattr, SampleEntity.view({}), 'string_field')
+
+    def test_immutable(self):
+        view = ImmutableSampleEntity.view(dict(name='one'))
+        assert view.color is Color.Red
+        self.assertRaises(AttributeError, setattr, view, 'name', 'two')
+
+
+class FastGetTests(TestCase):
+
+    def test_fields_are_specialized(self):
+        field = SampleEntity.__dict__['string_field']
+        assert isinstance(field, StringField) and type(field) is not StringField
+        assert type(ListEntity.__dict__['field']) is ListField  # ListField.unbox isn't identity
+
+    def test_read_semantics_preserved(self):
+        de = DateEntity(field=NOW)
+        assert de.field == NOW
+        assert isinstance(de.field_w_default_callable, datetime.datetime)
+        self.assertRaises(AttributeError, getattr, de, "field_wo_required_w_nullable")
+        de.field_wo_required_w_nullable = None
+        assert de.field_wo_required_w_nullable is None
+
+        entity = DeletableEntity()
+        assert entity.name == 'default'
+        del entity.name
+        self.assertRaises(AttributeError, getattr, entity, 'name')
+        assert DerivedSampleEntity.enum_field is ChooseOne.A
+
+
+    def test_property_overrides_not_specialized(self):
+        class ComputedDefaultField(StringField):
+            @property
+            def default(self):
+                return 'computed'
+
+        class AlwaysNullableField(StringField):
+            @property
+            def nullable(self):
+                return True
+
+        class PropertyEntity(Entity):
+            computed = ComputedDefaultField(default='stored')
+            always_nullable = AlwaysNullableField(required=False)
+
+        for name in ('computed', 'always_nullable'):
+            assert not getattr(PropertyEntity.__dict__[name], '_fast_get', False)
+        entity = PropertyEntity()
+        assert entity.computed == 'computed'
+        entity.always_nullable = None
+        assert entity.always_nullable is None
+
+    def test_stored_null_reads_as_stored(self):
+        class WithDefault(Entity):
+            number = IntField(default=3, required=False)
+
+        entity = WithDefault()
+        entity.number = NULL
+        assert entity.number is NULL
+
+
+class ImmutableSampleEntity(ImmutableEntity):
+    name = StringField()
+    created = DateField(required=False)
+    color = EnumField(Color, default=Color.Red)
+
+
+class DeletableEntity(Entity):
+    name = StringField(default='default', required=False)
+
+
+class PickleTests(TestCase):
+
+    def round_trip(self, entity):
+        return [pickle.loads(pickle.dumps(entity, protocol))
+                for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]
+
+    def test_round_trip(self):
+        se = SampleEntity(string_field='bazaar', integer_field=28, enum_field=ChooseOne.B)
+        for copy in self.round_trip(se):
+            assert copy == se
+            assert copy.dump() == se.dump()
+            assert copy._initd
+            assert 'string_field_w_default' not in copy.__dict__
+
+    def test_custom_init_not_called(self):
+        dse = DerivedSampleEntity(new_field=5, string_field='bazaar', integer_field=28)
+        for copy in self.round_trip(dse):
+            assert copy == dse
+            assert copy.enum_field == ChooseOne.A
+
+    def test_immutable_entity(self):
+        ie = ImmutableSampleEntity(name='one', created=isoparse('2016-03-23'))
+        for copy in self.round_trip(ie):
+            assert copy.created == ie.created
+            assert copy.color is Color.Red
+            self.assertRaises(AttributeError, setattr, copy, 'name', 'two')
+
+    def test_deleted_field_stays_deleted(self):
+        entity = DeletableEntity()
+        del entity.name
+        copy = pickle.loads(pickle.dumps(entity, pickle.HIGHEST_PROTOCOL))
+        self.assertRaises(AttributeError, getattr, copy, 'name')
+        assert copy.dump() == {}
+
+    def test_extra_attributes(self):
+        se = SampleEntity(string_field='bazaar', integer_field=28, enum_field=ChooseOne.B)
+        se.not_a_field = 'extra'
+        copy = pickle.loads(pickle.dumps(se, pickle.HIGHEST_PROTOCOL))
+        assert copy.not_a_field == 'extra'
+
+    def test_null_is_singleton(self):
+        assert pickle.loads(pickle.dumps(NULL)) is NULL
+
+    def test_deepcopy(self):
+        se = SampleEntity(string_field='bazaar', integer_field=28, enum_field=ChooseOne.B)
+        copy = deepcopy(se)
+        assert copy == se and copy is not se
+        assert copy._initd
+
+
 # TODO:
 #  - test MapField eq/hash
 #  - test ComposableField eq/hash
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from logging import getLogger
+from unittest import TestCase
+
+from auxlib import instrumentation
+from auxlib.entity import DateField, Entity, Field, IntField, StringField
+
+log = getLogger(__name__)
+
+CLASS_KEY = __name__ + '.Sample'
+
+
+class Sample(Entity):
+    name = StringField()
+    count = IntField(default=0)
+    created = DateField(required=False)
+
+
+class CapturingHandler(object):
+
+    def __init__(self):
+        self.messages = []
+
+    def log(self, level, msg, *args):
+        self.messages.append(msg % args)
+
+
+class InstrumentationTests(TestCase):
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled_by_default(self):
+        original_get = Field.__dict__['__get__']
+        sample = Sample(name='one')
+        sample.name
+        assert not instrumentation.is_enabled()
+        assert instrumentation.snapshot() == {}
+        assert Field.__dict__['__get__'] is original_get
+
+    def test_counts_get_set_and_dump(self):
+        sample = Sample(name='one', created='2016-03-23')
+        instrumentation.enable()
+        sample.name
+        sample.name
+        sample.count = 4
+        sample.dump()
+
+        stats = instrumentation.snapshot()[CLASS_KEY]
+        assert stats['name']['get']['count'] == 3  # two reads plus one from dump()
+        assert stats['count']['set']['count'] == 1
+        assert stats['created']['dump']['count'] == 1
+        assert stats['name']['get']['seconds'] >= 0
+
+    def test_disable_restores_methods(self):
+        original_get = Field.__dict__['__get__']
+        original_dump = DateField.__dict__['dump']
+        instrumentation.enable()
+        instrumentation.enable()  # idempotent
+        assert Field.__dict__['__get__'] is not original_get
+        instrumentation.disable()
+        assert Field.__dict__['__get__'] is original_get
+        assert DateField.__dict__['dump'] is original_dump
+
+        Sample(name='two').name
+        assert instrumentation.snapshot() == {}
+
+    def test_failed_access_is_counted(self):
+        sample = Sample(name='one')
+        instrumentation.enable()
+        self.assertRaises(AttributeError, lambda: sample.created)
+        assert instrumentation.snapshot()[CLASS_KEY]['created']['get']['count'] == 1
+
+    def test_log_snapshot(self):
+        instrumentation.enable()
+        Sample(name='one').dump()
+        handler = CapturingHandler()
+        instrumentation.log_snapshot(handler)
+        assert len(handler.messages) == 1
+        assert '\n' not in handler.messages[0]
+        assert CLASS_KEY in handler.messages[0]
+
+    def test_fast_reads_restored_after_disable(self):
+        class LabelField(StringField):
+            pass
+
+        instrumentation.enable()
+
+        class During(Entity):
+            label = LabelField()
+
+        assert During(label='a').label == 'a'
+        instrumentation.disable()
+
+        class After(Entity):
+            label = LabelField()
+
+        assert getattr(After.__dict__['label'], '_fast_get', False)
+        assert After(label='b').label == 'b'
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from logging import getLogger
+import pickle
+from unittest import TestCase
+
+from auxlib.entity import Entity, IntField, StringField
+from auxlib.exceptions import BulkValidationError, ValidationError
+
+log = getLogger(__name__)
+
+
+class Record(Entity):
+    name = StringField()
+    count = IntField(default=0)
+
+
+def make_records(n):
+    return [dict(name='record-{0}'.format(q), count=q) for q in range(n)]
+
+
+class ParallelTests(TestCase):
+
+    def test_load_in_order(self):
+        records = make_records(50)
+        entities = Record.parallel_load(records, workers=2, chunksize=7)
+        assert [e.count for e in entities] == list(range(50))
+        assert entities[0]._initd
+
+    def test_load_generator_inline(self):
+        entities = Record.parallel_load((r for r in make_records(5)), workers=1)
+        assert [e.name for e in entities] == ['record-{0}'.format(q) for q in range(5)]
+
+    def test_dump_in_order(self):
+        entities = [Record(**r) for r in make_records(20)]
+        dumps = Record.parallel_dump(entities, workers=2, chunksize=3)
+        assert dumps == [e.dump() for e in entities]
+
+    def test_empty(self):
+        assert Record.parallel_load([], workers=2) == []
+
+    def test_errors_propagate(self):
+        records = make_records(10)
+        records[3]['count'] = 'three'
+        del records[8]['name']
+        try:
+            Record.parallel_load(records, workers=2, chunksize=2)
+        except BulkValidationError as e:
+            assert sorted(e.errors) == [3, 8]
+            assert all(isinstance(err, ValidationError) for err in e.errors.values())
+            assert e.results[3] is None and e.results[8] is None
+            assert e.results[4].count == 4
+            assert 'index 3' in str(e)
+        else:
+            self.fail("BulkValidationError not raised")
+
+    def test_validation_error_pickles(self):
+        error = pickle.loads(pickle.dumps(ValidationError('count', 'three', int)))
+        assert str(error) == str(ValidationError('count', 'three', int))
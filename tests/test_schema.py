@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from datetime import datetime
+from os import listdir
+from pickle import dumps as pickle_dumps, loads as pickle_loads
+from shutil import rmtree
+from tempfile import mkdtemp
+from json import dumps as json_dumps, loads as json_loads
+from unittest import TestCase
+
+from enum import Enum
+
+from auxlib import schema
+from auxlib.compat import string_types
+from auxlib.entity import (BooleanField, ComposableField, DateField, Entity, EnumField, IntField,
+                           ListField, MapField, NumberField, StringField)
+from auxlib.exceptions import ValidationError
+
+
+class Color(Enum):
+    red = 'red'
+    green = 'green'
+
+
+class Part(Entity):
+    sku = StringField()
+    quantity = IntField(default=1)
+    color = EnumField(Color, required=False, nullable=True)
+
+
+class Assembly(Entity):
+    name = StringField()
+    built = DateField(default=datetime(2016, 3, 23))
+    primary = ComposableField(Part)
+    parts = ListField(Part, default=())
+    weight = NumberField(required=False)
+    tags = ListField(string_types, required=False)
+    active = BooleanField(default=True)
+
+
+class DerivedAssembly(Assembly):
+    name = 'derived'
+
+
+class Labeled(Entity):
+    label = StringField()
+
+
+class Tagged(Entity):
+    label = StringField()
+
+
+class Pair(Entity):
+    label = StringField()
+    first = ComposableField(Labeled)
+    second = ComposableField(Tagged)
+
+
+class WithMap(Entity):
+    part = ComposableField(Part)
+    extra = MapField(required=False)
+
+
+class JsonSchemaTests(TestCase):
+
+    def test_properties(self):
+        doc = Assembly.json_schema()
+        assert doc['$schema'] == schema.SCHEMA_URI
+        assert doc['title'] == 'Assembly'
+        assert doc['required'] == ['name', 'primary']
+        props = doc['properties']
+        assert list(props) == ['name', 'built', 'primary', 'parts', 'weight', 'tags', 'active']
+        assert props['name'] == {'type': 'string'}
+        assert props['built'] == {'type': 'string', 'format': 'date-time',
+                                  'default': '2016-03-23T00:00:00'}
+        assert props['primary'] == {'$ref': '#/definitions/Part'}
+        assert props['parts'] == {'type': 'array', 'items': {'$ref': '#/definitions/Part'},
+                                  'default': []}
+        assert props['tags'] == {'type': 'array', 'items': {'type': 'string'}}
+        assert props['weight'] == {'type': 'number'}
+        assert props['active'] == {'type': 'boolean', 'default': True}
+
+    def test_definitions(self):
+        doc = Assembly.json_schema()
+        assert list(doc['definitions']) == ['Part']
+        part = doc['definitions']['Part']
+        assert part['required'] == ['sku']
+        assert part['properties']['quantity'] == {'type': 'integer', 'default': 1}
+        assert part['properties']['color'] == {'enum': ['red', 'green', None]}
+
+    def test_class_override_is_default(self):
+        doc = DerivedAssembly.json_schema()
+        assert doc['required'] == ['primary']
+        assert doc['properties']['name']['default'] == 'derived'
+
+    def test_map_field_and_serializable(self):
+        doc = WithMap.json_schema()
+        assert doc['properties']['extra'] == {'type': 'object'}
+        assert json_loads(json_dumps(doc)) == doc
+
+
+class JsonLoadsTests(TestCase):
+
+    json_str = json_dumps({
+        'name': 'assembly',
+        'primary': {'sku': 'a1', 'color': 'red'},
+        'parts': [{'sku': 'b1', 'quantity': 3}, {'sku': 'b2', 'color': None}],
+        'tags': ['x', 'y'],
+    })
+
+    def test_matches_plain_decoding(self):
+        assembly = Assembly.from_json(self.json_str)
+        assert assembly == Assembly(**json_loads(self.json_str))
+        assert assembly.primary.color is Color.red
+        assert assembly.parts[1].color is None
+        assert assembly.parts[0].quantity == 3
+
+    def test_objects_boxed_by_position(self):
+        pair = Pair.from_json('{"label": "p", "first": {"label": "a"}, "second": {"label": "b"}}')
+        assert type(pair.first) is Labeled and type(pair.second) is Tagged
+
+    def test_subclass_shaped_objects_built_as_field_type(self):
+        class Base(Entity):
+            label = StringField()
+
+        class Extended(Base):
+            extra = StringField(required=False)
+
+        class Holder(Entity):
+            base = ComposableField(Base)
+            extended = ComposableField(Extended, required=False)
+
+        holder = Holder.from_json('{"base": {"label": "a", "extra": "x"}}')
+        assert type(holder.base) is Base
+        assert holder.base.dump() == {'label': 'a'}
+
+    def test_map_fields(self):
+        entity = WithMap.from_json('{"part": {"sku": "a"}, "extra": {"sku": "b"}}')
+        assert entity.extra['sku'] == 'b'
+
+    def test_errors(self):
+        self.assertRaises(ValidationError, Assembly.from_json,
+                          '{"name": "a", "primary": {"sku": "a", "quantity": "three"}}')
+        self.assertRaises(ValidationError, Assembly.from_json,
+                          '{"name": "a", "primary": {"quantity": 3}}')
+        self.assertRaises(ValidationError, Assembly.from_json, '{"primary": {"sku": "a"}}')
+        self.assertRaises(ValueError, Assembly.from_json, '{"name": ')
+
+
+class EntityFromSchemaTests(TestCase):
+
+    def setUp(self):
+        schema._generated.clear()
+
+    def test_round_trip(self):
+        generated = schema.entity_from_schema(Assembly.json_schema())
+        assert generated.__name__ == 'Assembly'
+        assert list(generated.__fields__) == list(Assembly.__fields__)
+        assert generated.json_schema() == Assembly.json_schema()
+
+        assembly = Assembly(name='a', primary=Part(sku='p', color='red'), parts=[Part(sku='q')])
+        copy = generated.from_json(assembly.json())
+        assert copy.dump() == assembly.dump()
+        assert copy.primary.color.value == 'red'
+        assert copy.built == datetime(2016, 3, 23)
+        assert pickle_loads(pickle_dumps(copy)).dump() == assembly.dump()
+
+    def test_memoized_by_schema(self):
+        generated = schema.entity_from_schema(Assembly.json_schema())
+        assert schema.entity_from_schema(json_loads(json_dumps(Assembly.json_schema()))) \
+            is generated
+        assert schema.entity_from_schema(Part.json_schema()) is not generated
+
+    def test_field_classes(self):
+        document = {
+            'title': 'Order',
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'integer'},
+                'placed': {'type': ['string', 'null'], 'format': 'date-time'},
+                'status': {'enum': ['open', 'closed', 'in-progress'], 'default': 'open'},
+                'notes': {'type': 'array', 'items': {'type': 'string'}},
+                'address': {'type': 'object', 'properties': {'city': {'type': 'string'}},
+                            'required': ['city']},
+                'extra': {'type': 'object'},
+            },
+            'required': ['id'],
+        }
+        order_class = schema.entity_from_schema(document)
+        fields = order_class.__fields__
+        assert isinstance(fields['id'], IntField) and fields['id'].required
+        assert isinstance(fields['placed'], DateField) and fields['placed'].nullable
+        assert isinstance(fields['status'], EnumField)
+        assert isinstance(fields['notes'], ListField) and not fields['notes'].required
+        assert isinstance(fields['address'], ComposableField)
+        assert isinstance(fields['extra'], MapField)
+
+        order = order_class(id=1, placed='2016-03-23', address={'city': 'Austin'})
+        assert order.status.value == 'open'
+        assert order_class(id=2, status='in-progress').status.name == 'member_2'
+        assert order.address.city == 'Austin'
+        self.assertRaises(ValidationError, order_class, id=3, notes=[1])
+        self.assertRaises(ValidationError, order_class, id=4, address={})
+
+    def test_titles_shadowing_imported_names(self):
+        document = {
+            'title': 'Root',
+            'type': 'object',
+            'properties': {
+                'a': {'type': 'object', 'title': 'Entity',
+                      'properties': {'v': {'type': 'integer'}}},
+                'b': {'type': 'object', 'title': 'Enum',
+                      'properties': {'w': {'type': 'integer'}}},
+                'c': {'enum': ['x', 'y']},
+            },
+        }
+        root_class = schema.entity_from_schema(document)
+        assert list(root_class.__fields__) == ['a', 'b', 'c']
+        assert list(root_class.__fields__['a'].type.__fields__) == ['v']
+        root = root_class(a={'v': 1}, b={'w': 2}, c='y')
+        assert (root.a.v, root.b.w) == (1, 2)
+        assert root.a.__class__.__name__ not in ('Entity', 'Enum')
+        assert root.c.name == 'y'
+
+    def test_pickle_sanitized_title(self):
+        document = {'title': 'My Car', 'type': 'object',
+                    'properties': {'engine': {'title': 'V-8 engine', 'type': 'object',
+                                              'properties': {'size': {'type': 'integer'}}}}}
+        car_class = schema.entity_from_schema(document)
+        assert car_class.__name__ == 'My_Car'
+        car = car_class(engine={'size': 8})
+        copy = pickle_loads(pickle_dumps(car))
+        assert type(copy) is car_class and copy.engine.size == 8
+
+    def test_unsupported_schema(self):
+        self.assertRaises(ValidationError, schema.entity_from_schema,
+                          {'properties': {'anything': {}}})
+        self.assertRaises(ValidationError, schema.entity_from_schema,
+                          {'properties': {'part': {'$ref': '#/definitions/Missing'}}})
+
+    def test_cache_dir(self):
+        cache_dir = mkdtemp()
+        try:
+            generated = schema.entity_from_schema(Part.json_schema(), cache_dir=cache_dir)
+            assert len(listdir(cache_dir)) == 1
+
+            schema._generated.clear()
+            source, schema.entity_source = schema.entity_source, None  # must not be called
+            try:
+                reloaded = schema.entity_from_schema(Part.json_schema(), cache_dir=cache_dir)
+            finally:
+                schema.entity_source = source
+            assert reloaded is not generated
+            assert reloaded(sku='a').dump() == generated(sku='a').dump()
+        finally:
+            rmtree(cache_dir)
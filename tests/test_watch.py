@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from os import mkdir, rename, symlink
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Lock
+from time import sleep
+from unittest import TestCase, skipIf
+
+from auxlib import watch
+
+
+class Recorder(object):
+
+    def __init__(self):
+        self.lock = Lock()
+        self.calls = []
+
+    def __call__(self, paths):
+        with self.lock:
+            self.calls.append(paths)
+
+    def wait_for_calls(self, count, timeout=5.0):
+        for _ in range(int(timeout / 0.01)):
+            if len(self.calls) >= count:
+                break
+            sleep(0.01)
+        return self.calls
+
+
+class PollingWatcherTests(TestCase):
+    use_inotify = False
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.path = join(self.directory, 'config.yml')
+        self.other = join(self.directory, 'other.yml')
+        self.write(self.path, 'a: 1\n')
+        self.recorder = Recorder()
+        self.watcher = watch.FileWatcher([self.path, self.other], self.recorder, interval=0.02,
+                                         debounce=0.2, use_inotify=self.use_inotify).start()
+
+    def tearDown(self):
+        self.watcher.stop()
+        rmtree(self.directory)
+
+    @staticmethod
+    def write(path, text):
+        with open(path, 'w') as fh:
+            fh.write(text)
+
+    def test_backend(self):
+        assert isinstance(self.watcher.backend, watch._Poller)
+
+    def test_rapid_writes_debounced(self):
+        sleep(0.05)
+        for q in range(5):
+            self.write(self.path, 'a: {0}\n'.format(q * 1000))
+            sleep(0.01)
+        self.write(self.other, 'b: 2\n')
+        calls = self.recorder.wait_for_calls(1)
+        sleep(0.3)
+        assert calls == [set([self.path, self.other])]
+
+    def test_replaced_by_rename(self):
+        sleep(0.05)
+        temp_path = join(self.directory, 'config.yml.tmp')
+        self.write(temp_path, 'a: 22\n')
+        rename(temp_path, self.path)
+        assert self.recorder.wait_for_calls(1) == [set([self.path])]
+
+    def start_watcher(self, path):
+        self.watcher.stop()
+        recorder = Recorder()
+        self.watcher = watch.FileWatcher([path], recorder, interval=0.02, debounce=0.2,
+                                         use_inotify=self.use_inotify).start()
+        sleep(0.05)
+        return recorder
+
+    def test_configmap_symlink_swap(self):
+        # the layout kubernetes uses for a mounted ConfigMap
+        mount = join(self.directory, 'mount')
+        mkdir(mount)
+        for version in ('..v1', '..v2'):
+            mkdir(join(mount, version))
+            self.write(join(mount, version, 'app.yml'), 'version: {0}\n'.format(version))
+        symlink('..v1', join(mount, '..data'))
+        path = join(mount, 'app.yml')
+        symlink(join('..data', 'app.yml'), path)
+        recorder = self.start_watcher(path)
+
+        symlink('..v2', join(mount, '..data_tmp'))
+        rename(join(mount, '..data_tmp'), join(mount, '..data'))
+        assert recorder.wait_for_calls(1) == [set([path])]
+
+    def test_symlink_target_written(self):
+        target_directory = join(self.directory, 'target')
+        mkdir(target_directory)
+        target = join(target_directory, 'app.yml')
+        self.write(target, 'a: 1\n')
+        path = join(self.directory, 'app.yml')
+        symlink(target, path)
+        recorder = self.start_watcher(path)
+
+        self.write(target, 'a: 22\n')
+        assert recorder.wait_for_calls(1) == [set([path])]
+
+    def test_stop(self):
+        self.watcher.stop()
+        assert not self.watcher._thread.is_alive()
+        self.write(self.path, 'a: 3\n')
+        sleep(0.3)
+        assert self.recorder.calls == []
+
+
+@skipIf(watch._libc() is None, "inotify is not available")
+class InotifyWatcherTests(PollingWatcherTests):
+    use_inotify = True
+
+    def test_backend(self):
+        assert isinstance(self.watcher.backend, watch._Inotify)